@@ -0,0 +1,345 @@
+import html
+import os
+import re
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
+
+from text_processor import (
+    STAT,
+    get_stat_summary,
+    process_paragraph,
+    reset_stat,
+)
+from util.finding import Finding
+from util.language import DEFAULT_LANGUAGE
+from util.line_format import LineFormat
+from util.readability import Readability
+from util.results import SentenceResults
+from util.word_lists import complex_phrases
+
+
+# characters that XML 1.0 does not allow even escaped, so Word would refuse to open the document
+INVALID_XML_CHARACTERS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+# the same categories as in the terminal output
+FINDING_FORMATS = {
+    Finding.ADVERBS: LineFormat.CYAN,
+    Finding.QUALIFIERS: LineFormat.CYAN,
+    Finding.PASSIVE_VOICE: LineFormat.GREEN,
+    Finding.COMPLEX: LineFormat.PURPLE,
+    Finding.BAD_START: LineFormat.GREEN,
+}
+
+READABILITY_FORMATS = {
+    Readability.HARD: LineFormat.YELLOW,
+    Readability.VERY_HARD: LineFormat.RED,
+}
+
+TEXT_COLORS = {
+    LineFormat.BLUE: '1E5AC8',
+    LineFormat.CYAN: '008B8B',
+    LineFormat.GREEN: '228B22',
+    LineFormat.PURPLE: '8B008B',
+    LineFormat.YELLOW: 'B8860B',
+    LineFormat.RED: 'C00000',
+}
+
+BACKGROUND_COLORS = {
+    LineFormat.YELLOW: 'FFF2A8',
+    LineFormat.RED: 'FFC9C9',
+}
+
+
+def get_finding_hint(finding: Finding, phrase: str) -> str:
+    """
+    Return a short recommendation for the highlighted phrase.
+    """
+    if finding is Finding.COMPLEX and phrase.lower() in complex_phrases:
+        return f'Simpler alternatives: {", ".join(complex_phrases[phrase.lower()])}'
+    return {
+        Finding.ADVERBS: 'Adverb. Try to remove it or use a stronger verb.',
+        Finding.QUALIFIERS: 'Qualifier. Try to remove it.',
+        Finding.PASSIVE_VOICE: 'Passive voice. Use active voice instead.',
+        Finding.COMPLEX: 'This phrase has simpler alternatives.',
+        Finding.BAD_START: 'Cliché sentence opener. Rebuild the sentence to avoid it.',
+    }[finding]
+
+
+def iter_segments(paragraph: str, sentence_results: list):
+    """
+    Split the paragraph at every sentence and finding boundary.
+    Yields (text, readability or None, findings) for each piece, where findings are the FindingSpans covering it.
+    """
+    boundaries = {0, len(paragraph)}
+    for result in sentence_results:
+        boundaries.update((result.start, result.end))
+        for finding in result.findings:
+            boundaries.update((finding.start, finding.end))
+    points = sorted(boundaries)
+
+    sentences = iter(sentence_results)
+    sentence = next(sentences, None)
+    for start, end in zip(points, points[1:]):
+        while sentence is not None and sentence.end <= start:
+            sentence = next(sentences, None)
+        if sentence is not None and sentence.start <= start:
+            findings = tuple(finding for finding in sentence.findings if finding.start <= start and end <= finding.end)
+            yield paragraph[start:end], sentence.readability, findings
+        else:
+            yield paragraph[start:end], None, ()
+
+
+class HtmlExporter:
+    """
+    Writes a self-contained HTML report, paragraph by paragraph.
+    The file is created by start(), so nothing is written until there is something to export.
+    """
+    def __init__(self, path: str, title: str = 'remarq report'):
+        self.path = path
+        self.title = title
+        self.file = None
+
+    def start(self) -> None:
+        """
+        Create the file and write the head of the report.
+        """
+        self.file = open(self.path, 'w', encoding='utf-8')
+        styles = [
+            f'.{finding.stat_key} {{ color: #{TEXT_COLORS[line_format]}; }}'
+            for finding, line_format in FINDING_FORMATS.items()
+        ] + [
+            f'.{readability.name.lower()} {{ background: #{BACKGROUND_COLORS[line_format]}; }}'
+            for readability, line_format in READABILITY_FORMATS.items()
+        ]
+        self.file.write(
+            '<!DOCTYPE html>\n'
+            f'<html>\n<head>\n<meta charset="utf-8">\n<title>{html.escape(self.title)}</title>\n'
+            '<style>\n'
+            'body { font-family: sans-serif; max-width: 50em; margin: 2em auto; line-height: 1.5; }\n'
+            + '\n'.join(styles) +
+            '\n</style>\n</head>\n<body>\n'
+        )
+
+    def write_paragraph(self, paragraph: str, sentence_results: list) -> None:
+        """
+        Append the paragraph with its highlights to the report.
+        """
+        if not paragraph:
+            self.file.write('<p>&nbsp;</p>\n')
+            return
+        self.file.write('<p>')
+        for text, readability, findings in iter_segments(paragraph, sentence_results):
+            classes = [readability.name.lower()] if readability in READABILITY_FORMATS else []
+            classes += [finding.finding.stat_key for finding in findings]
+            titles = [get_finding_hint(finding.finding, paragraph[finding.start:finding.end]) for finding in findings]
+            if classes:
+                title = f' title="{html.escape(" ".join(titles))}"' if titles else ''
+                self.file.write(f'<span class="{" ".join(classes)}"{title}>{html.escape(text)}</span>')
+            else:
+                self.file.write(html.escape(text))
+        self.file.write('</p>\n')
+
+    def close(self, stat: dict, metrics: tuple = ('ari',), language: str = DEFAULT_LANGUAGE) -> None:
+        """
+        Append the statistics summary and finish the report.
+        """
+        self.file.write('<hr>\n<div class="summary">\n')
+        for line_format, text, suffix in get_stat_summary(stat, metrics, language):
+            if line_format:
+                text = f'<span style="color: #{TEXT_COLORS[line_format]};">{html.escape(text)}</span>'
+            else:
+                text = html.escape(text)
+            self.file.write(f'<div>{text}{html.escape(suffix)}</div>\n' if text else '<br>\n')
+        self.file.write('</div>\n</body>\n</html>\n')
+        self.file.close()
+
+    def discard(self) -> None:
+        """
+        Close and remove the unfinished report, if it was started.
+        """
+        if self.file is not None:
+            self.file.close()
+            os.remove(self.path)
+            self.file = None
+
+
+class DocxExporter:
+    """
+    Writes a .docx with coloured runs and a comment for every finding.
+    The document XML is streamed straight into the archive (comments go through a temporary file),
+    so the whole document tree is never held in memory, unlike with python-docx.
+    The file is created by start(), so nothing is written until there is something to export.
+    """
+    NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/comments.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.comments+xml"/>'
+        '</Types>'
+    )
+    PACKAGE_RELATIONSHIPS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    DOCUMENT_RELATIONSHIPS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/comments" '
+        'Target="comments.xml"/>'
+        '</Relationships>'
+    )
+
+    def __init__(self, path: str, author: str = 'remarq'):
+        self.path = path
+        self.author = escape(author, {'"': '&quot;'})
+        self.archive = None
+        self.comments = None
+        self.document = None
+        self.comment_id = 0
+
+    def start(self) -> None:
+        """
+        Create the archive and start streaming the document into it.
+        """
+        self.archive = zipfile.ZipFile(self.path, 'w', zipfile.ZIP_DEFLATED)
+        self.archive.writestr('[Content_Types].xml', self.CONTENT_TYPES)
+        self.archive.writestr('_rels/.rels', self.PACKAGE_RELATIONSHIPS)
+        self.archive.writestr('word/_rels/document.xml.rels', self.DOCUMENT_RELATIONSHIPS)
+        self.comments = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.document = self.archive.open('word/document.xml', 'w')
+        self._write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document xmlns:w="{self.NAMESPACE}"><w:body>'
+        )
+
+    def _write(self, xml: str) -> None:
+        self.document.write(xml.encode('utf-8'))
+
+    @staticmethod
+    def _run(text: str, color: str = None, fill: str = None) -> str:
+        properties = ''
+        if color:
+            properties += f'<w:color w:val="{color}"/>'
+        if fill:
+            properties += f'<w:shd w:val="clear" w:color="auto" w:fill="{fill}"/>'
+        properties = f'<w:rPr>{properties}</w:rPr>' if properties else ''
+        text = escape(INVALID_XML_CHARACTERS.sub('', text))
+        return f'<w:r>{properties}<w:t xml:space="preserve">{text}</w:t></w:r>'
+
+    def _add_comment(self, text: str) -> int:
+        comment_id = self.comment_id
+        self.comment_id += 1
+        self.comments.write(
+            f'<w:comment w:id="{comment_id}" w:author="{self.author}" w:initials="rq">'
+            f'<w:p>{self._run(text)}</w:p></w:comment>'
+        )
+        return comment_id
+
+    def write_paragraph(self, paragraph: str, sentence_results: list) -> None:
+        """
+        Append the paragraph with its highlights and comments to the document.
+        """
+        self._write('<w:p>')
+        # FindingSpan -> comment id, for the comments that are open at the current position
+        open_comments = {}
+        for text, readability, findings in iter_segments(paragraph, sentence_results):
+            for finding in [finding for finding in open_comments if finding not in findings]:
+                comment_id = open_comments.pop(finding)
+                self._write(
+                    f'<w:commentRangeEnd w:id="{comment_id}"/><w:r><w:commentReference w:id="{comment_id}"/></w:r>'
+                )
+            for finding in findings:
+                if finding not in open_comments:
+                    hint = get_finding_hint(finding.finding, paragraph[finding.start:finding.end])
+                    open_comments[finding] = self._add_comment(hint)
+                    self._write(f'<w:commentRangeStart w:id="{open_comments[finding]}"/>')
+            color = TEXT_COLORS[FINDING_FORMATS[findings[-1].finding]] if findings else None
+            fill = BACKGROUND_COLORS[READABILITY_FORMATS[readability]] if readability in READABILITY_FORMATS else None
+            self._write(self._run(text, color, fill))
+        for comment_id in open_comments.values():
+            self._write(f'<w:commentRangeEnd w:id="{comment_id}"/><w:r><w:commentReference w:id="{comment_id}"/></w:r>')
+        self._write('</w:p>')
+
+    def close(self, stat: dict, metrics: tuple = ('ari',), language: str = DEFAULT_LANGUAGE) -> None:
+        """
+        Append the statistics summary and finish the document.
+        """
+        self._write('<w:p/>')
+        for line_format, text, suffix in get_stat_summary(stat, metrics, language):
+            runs = self._run(text, TEXT_COLORS.get(line_format)) if text else ''
+            runs += self._run(suffix) if suffix else ''
+            self._write(f'<w:p>{runs}</w:p>')
+        self._write('</w:body></w:document>')
+        self.document.close()
+
+        self.comments.seek(0)
+        with self.archive.open('word/comments.xml', 'w') as comments:
+            comments.write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<w:comments xmlns:w="{self.NAMESPACE}">'.encode('utf-8')
+            )
+            while chunk := self.comments.read(64 * 1024):
+                comments.write(chunk.encode('utf-8'))
+            comments.write(b'</w:comments>')
+        self.comments.close()
+        self.archive.close()
+
+    def discard(self) -> None:
+        """
+        Close and remove the unfinished document, if it was started.
+        """
+        if self.archive is None:
+            return
+        for stream in (self.document, self.comments):
+            if stream is not None:
+                stream.close()
+        self.archive.close()
+        os.remove(self.path)
+        self.archive = None
+
+
+def export_text(paragraphs, exporters: list, metrics: tuple = ('ari',), language: str = DEFAULT_LANGUAGE) -> dict:
+    """
+    Process the paragraphs one at a time and pass each of them to the exporters right away,
+    so memory use does not grow with the size of the text. Returns the text statistics.
+    The exporters are started once the first paragraph is read. If reading or processing fails,
+    their unfinished outputs are removed.
+    """
+    reset_stat()
+    started = finished = False
+    try:
+        for paragraph in paragraphs:
+            sentence_results = []
+            if paragraph != '':
+                STAT['total_paragraphs'] += 1
+                results = SentenceResults()
+                process_paragraph(paragraph, results=results, language=language)
+                sentence_results = list(results)
+            if not started:
+                started = True
+                for exporter in exporters:
+                    exporter.start()
+            for exporter in exporters:
+                exporter.write_paragraph(paragraph, sentence_results)
+        if not started:
+            for exporter in exporters:
+                exporter.start()
+        for exporter in exporters:
+            exporter.close(STAT, metrics, language)
+        finished = True
+    finally:
+        if not finished:
+            for exporter in exporters:
+                exporter.discard()
+    return STAT
@@ -0,0 +1,472 @@
+#!/usr/bin/env python
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from xml.etree import ElementTree
+
+import reference_processor
+from exporter import (
+    DocxExporter,
+    HtmlExporter,
+    export_text,
+)
+from text_processor import (
+    STAT,
+    process_paragraph,
+    process_text,
+    reset_stat,
+)
+from util.corpus_stat import (
+    CorpusStat,
+    DocumentStat,
+)
+from util.line_format import LineFormat
+from util.word_lists import (
+    complex_phrases,
+    ly_words_not_adverbs,
+    passive_voice_pre_words,
+    qualifier_linkers,
+    qualifying_words,
+    sentence_starters,
+)
+
+
+PLAIN_WORDS = (
+    'the', 'a', 'dog', 'report', 'team', 'code', 'runs', 'made', 'house', 'number', 'of', 'we', 'i', 'my',
+    'it', 'is', 'clear', 'that', 'there', 'and', 'to', 'in', 'fact', 'was', 'were', 'finished', 'blue',
+)
+UNICODE_WORDS = (
+    'café', 'naïve', 'Ünïcödé', 'Ελληνικά', 'Москва', '日本語', 'straße', 'emoji🙂', 'ﬁne', 'İstanbul',
+    'שלום', 'नमस्ते', 'مرحبا', '文。', '吗？', 'है।',
+)
+PUNCTUATION = ('.', '!', '?', ',', ';', ':', '...', '—', '"', "'", '(', ')', '/', '-', '\\')
+MARKERS = tuple(LineFormat.FORMAT_TO_SYMBOL_MAPPER.values())
+# all C0 control characters but the line breaks, which never get into a paragraph
+CONTROL_CHARACTERS = tuple(chr(code) for code in range(0x20) if chr(code) not in '\n\r') + ('\x7f', '\ufffe')
+
+
+def reference_engine(text: list) -> tuple:
+    """
+    The reference oracle: the frozen copy of the processing flow in reference_processor.
+    """
+    reference_processor.reset_stat()
+    processed_text, stat = reference_processor.process_text(text)
+    return processed_text, dict(stat)
+
+
+def current_engine(text: list) -> tuple:
+    """
+    The process_text() flow that remarq uses.
+    """
+    reset_stat()
+    processed_text, stat = process_text(text)
+    return processed_text, dict(stat)
+
+
+def streaming_engine(text: list) -> tuple:
+    """
+    Paragraph by paragraph processing, as used by the exporters.
+    """
+    reset_stat()
+    processed_text = []
+    for paragraph in text:
+        if paragraph != '':
+            STAT['total_paragraphs'] += 1
+            processed_text.append(process_paragraph(paragraph))
+        else:
+            processed_text.append('')
+    return processed_text, dict(STAT)
+
+
+def cached_engine(text: list) -> tuple:
+    """
+    Processes every distinct paragraph once, replaying the cached result and statistics for repeats.
+    """
+    reset_stat()
+    cache = {}
+    processed_text = []
+    for paragraph in text:
+        if paragraph == '':
+            processed_text.append('')
+            continue
+        STAT['total_paragraphs'] += 1
+        if paragraph not in cache:
+            before = {key: value for key, value in STAT.items() if key != 'total_paragraphs'}
+            processed_paragraph = process_paragraph(paragraph)
+            cache[paragraph] = processed_paragraph, {key: STAT[key] - value for key, value in before.items()}
+        else:
+            processed_paragraph, delta = cache[paragraph]
+            for key, value in delta.items():
+                STAT[key] += value
+        processed_text.append(processed_paragraph)
+    return processed_text, dict(STAT)
+
+
+def _process_chunk(chunk: list) -> tuple:
+    reset_stat()
+    processed_text, stat = process_text(chunk)
+    return processed_text, dict(stat)
+
+
+def parallel_engine(text: list, executor: ProcessPoolExecutor, workers: int = 4) -> tuple:
+    """
+    Splits the text into chunks of paragraphs, processes them in worker processes and merges the results.
+    """
+    size = max(len(text) // workers, 1)
+    chunks = [text[i:i + size] for i in range(0, len(text), size)] or [[]]
+    processed_text = []
+    stat = dict.fromkeys(STAT, 0)
+    for processed_chunk, chunk_stat in executor.map(_process_chunk, chunks):
+        processed_text.extend(processed_chunk)
+        for key, value in chunk_stat.items():
+            stat[key] += value
+    return processed_text, stat
+
+
+def random_words(rng: random.Random, count: int) -> list:
+    """
+    Draw words and phrases that trigger every kind of finding, mixed with plain words.
+    """
+    pools = (
+        PLAIN_WORDS,
+        tuple(complex_phrases),
+        tuple(ly_words_not_adverbs),
+        ('really', 'quickly', 'simply', 'Obviously', 'rarely', 'oddly', 'LY', 'ly'),
+        tuple(qualifying_words),
+        qualifier_linkers,
+        tuple(passive_voice_pre_words),
+        ('finished', 'rejected', 'established', 'ed', 'Bed', 'red'),
+    )
+    return [rng.choice(rng.choice(pools)) for _ in range(count)]
+
+
+def random_sentence(rng: random.Random, length: int) -> str:
+    words = random_words(rng, length)
+    if rng.random() < 0.3:
+        words.insert(0, rng.choice(sentence_starters).strip())
+    elif words:
+        words[0] = words[0].capitalize()
+    return ' '.join(words) + rng.choice(('.', '!', '?', '.', '.', ''))
+
+
+def generate_plain(rng: random.Random) -> list:
+    return [
+        ' '.join(random_sentence(rng, rng.randint(1, 25)) for _ in range(rng.randint(1, 6))) if rng.random() > 0.1
+        else ''
+        for _ in range(rng.randint(1, 30))
+    ]
+
+
+def generate_overlapping(rng: random.Random) -> list:
+    # phrases that contain each other or repeat within the same sentence
+    phrases = [phrase for phrase in complex_phrases if ' ' in phrase] + ['number', 'a', 'of', 'as', 'yet']
+    return [
+        ' '.join(
+            f'{rng.choice(sentence_starters)} {" ".join(rng.choice(phrases) for _ in range(rng.randint(2, 12)))}.'
+            for _ in range(rng.randint(1, 4))
+        )
+        for _ in range(rng.randint(1, 20))
+    ]
+
+
+def generate_markers(rng: random.Random) -> list:
+    # text that already contains the symbols used for highlighting
+    paragraphs = []
+    for _ in range(rng.randint(1, 20)):
+        words = random_words(rng, rng.randint(1, 30))
+        for _ in range(rng.randint(1, 5)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(MARKERS))
+        paragraphs.append(' '.join(words).capitalize() + '.')
+    return paragraphs
+
+
+def generate_unicode(rng: random.Random) -> list:
+    paragraphs = []
+    for _ in range(rng.randint(1, 20)):
+        words = random_words(rng, rng.randint(1, 20)) + [rng.choice(UNICODE_WORDS) for _ in range(rng.randint(1, 10))]
+        rng.shuffle(words)
+        paragraphs.append(rng.choice(('', 'É', 'Ω', 'A ')) + ' '.join(words) + rng.choice(PUNCTUATION))
+    return paragraphs
+
+
+def generate_long(rng: random.Random) -> list:
+    return [random_sentence(rng, rng.randint(200, 2000)) for _ in range(rng.randint(1, 3))]
+
+
+def generate_punctuation(rng: random.Random) -> list:
+    return [
+        ''.join(rng.choice(PUNCTUATION + (' ', 'A', 'b', '1')) for _ in range(rng.randint(1, 40)))
+        for _ in range(rng.randint(1, 10))
+    ]
+
+
+def generate_control(rng: random.Random) -> list:
+    # e.g. form feeds and NUL bytes from text extracted out of other formats
+    paragraphs = []
+    for _ in range(rng.randint(1, 20)):
+        words = random_words(rng, rng.randint(1, 20))
+        for _ in range(rng.randint(1, 5)):
+            i = rng.randrange(len(words))
+            words[i] = rng.choice(('', words[i])) + rng.choice(CONTROL_CHARACTERS) + rng.choice(('', words[i]))
+        paragraphs.append(rng.choice(('', 'A ')) + ' '.join(words) + rng.choice(PUNCTUATION))
+    return paragraphs
+
+
+def generate_repeated(rng: random.Random) -> list:
+    # boilerplate-heavy documents, where caching pays off
+    pool = generate_plain(rng)
+    return [rng.choice(pool) for _ in range(rng.randint(50, 500))]
+
+
+GENERATORS = {
+    'plain': generate_plain,
+    'overlapping': generate_overlapping,
+    'markers': generate_markers,
+    'unicode': generate_unicode,
+    'long': generate_long,
+    'punctuation': generate_punctuation,
+    'control': generate_control,
+    'repeated': generate_repeated,
+}
+
+
+def run_engine(engine, text: list) -> tuple:
+    """
+    Run the engine on the text. Returns (result or the raised exception, seconds spent).
+    """
+    start_time = time.perf_counter()
+    try:
+        result = engine(text)
+    except Exception as err:
+        result = err
+    return result, time.perf_counter() - start_time
+
+
+def diff_results(expected: tuple, actual) -> list:
+    """
+    Describe the differences between the reference result and an engine result.
+    Every text is valid input, so an exception raised by the engine is a difference too.
+    """
+    if isinstance(actual, Exception):
+        return [f'raised {type(actual).__name__}: {actual}']
+    differences = []
+    expected_text, expected_stat = expected
+    actual_text, actual_stat = actual
+    for key in expected_stat.keys() | actual_stat.keys():
+        if expected_stat.get(key) != actual_stat.get(key):
+            differences.append(f'{key}: {expected_stat.get(key)} != {actual_stat.get(key)}')
+    if len(expected_text) != len(actual_text):
+        differences.append(f'paragraphs: {len(expected_text)} != {len(actual_text)}')
+    for i, (expected_paragraph, actual_paragraph) in enumerate(zip(expected_text, actual_text)):
+        if expected_paragraph != actual_paragraph:
+            differences.append(f'paragraph {i} findings differ')
+    return differences
+
+
+def fuzz(engines: dict, cases: int, seed: int = 0, generators: dict = GENERATORS) -> bool:
+    """
+    Generate random texts and compare every engine with the reference one.
+    Prints the speedup ratio for each case, and the differences if there are any.
+    Returns True if all the engines matched the reference, and nothing raised an exception.
+    """
+    rng = random.Random(seed)
+    matched = True
+    for case in range(cases):
+        kind = rng.choice(sorted(generators))
+        text = generators[kind](rng)
+        expected, reference_time = run_engine(reference_engine, text)
+        if isinstance(expected, Exception):
+            # nothing to compare the engines with, and the reference must handle any text
+            print(f'#{case} {kind:<12} {"reference":<10} ERROR    {type(expected).__name__}: {expected}')
+            matched = False
+            continue
+        for name, engine in engines.items():
+            actual, engine_time = run_engine(engine, text)
+            differences = diff_results(expected, actual)
+            speedup = reference_time / engine_time if engine_time else float('inf')
+            status = 'OK' if not differences else 'MISMATCH'
+            print(f'#{case} {kind:<12} {name:<10} {status:<8} speedup x{speedup:.2f}')
+            for difference in differences:
+                print(f'    {difference}')
+            matched = matched and not differences
+    return matched
+
+
+def merge_all(corpus_stats: list, order: list) -> CorpusStat:
+    merged = CorpusStat()
+    for i in order:
+        merged.merge(CorpusStat.from_dict(corpus_stats[i].to_dict()))
+    return merged
+
+
+def merge_tree(corpus_stats: list) -> CorpusStat:
+    # pairwise, as parallel workers would combine their results
+    level = [CorpusStat().merge(corpus_stat) for corpus_stat in corpus_stats]
+    while len(level) > 1:
+        level = [level[i].merge(level[i + 1]) if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def add_incrementally(document_stats: list, changed: int) -> CorpusStat:
+    # as the file index does: every document is added, then the changed one is taken away and added again
+    document_stats = [DocumentStat.from_dict(document_stat.to_dict()) for document_stat in document_stats]
+    total = CorpusStat()
+    for document_stat in document_stats:
+        total.add(document_stat)
+    total.subtract(document_stats[changed]).add(document_stats[changed])
+    return total.rebuild_trackers(document_stats)
+
+
+def diff_corpus_stats(expected: CorpusStat, exact: CorpusStat, actual: CorpusStat) -> list:
+    """
+    Describe how a merged CorpusStat differs from the one filled in a single pass.
+    Counters and all sketches but the top-K trackers must be equal. Top-K trackers must keep
+    the Space-Saving bounds: count - error <= exact count <= count, checked against the untruncated `exact` trackers.
+    """
+    differences = []
+    expected_data, actual_data = expected.to_dict(), actual.to_dict()
+    for key in ('counters', 'reading_levels', 'sentence_lengths', 'phrases'):
+        if expected_data[key] != actual_data[key]:
+            differences.append(f'{key} differ')
+    for key, tracker in actual.trackers.items():
+        exact_counters = exact.trackers[key].counters
+        for item, (count, error) in tracker.counters.items():
+            exact_count = exact_counters.get(item, (0, 0))[0]
+            if not count - error <= exact_count <= count:
+                differences.append(f'{key} {item!r}: {exact_count} is out of [{count - error}, {count}]')
+    return differences
+
+
+def fuzz_corpus_merge(cases: int, seed: int = 0, generators: tuple = ('plain', 'overlapping', 'repeated')) -> bool:
+    """
+    Split generated texts into documents, and check that merging their CorpusStats in any order
+    (and through to_dict/from_dict), or adding and subtracting their DocumentStats,
+    gives the same result as a single pass over all of them.
+    Returns True if all the merges matched.
+    """
+    rng = random.Random(seed)
+    matched = True
+    for case in range(cases):
+        documents = [GENERATORS[rng.choice(generators)](rng) for _ in range(rng.randint(2, 8))]
+        corpus_stats = []
+        document_stats = []
+        single_pass = CorpusStat()
+        exact = CorpusStat(top_k=10 ** 6)
+        for document in documents:
+            corpus_stat = CorpusStat()
+            document_stat = DocumentStat()
+            for target in (corpus_stat, document_stat, single_pass, exact):
+                reset_stat()
+                process_text(document, target)
+            corpus_stats.append(corpus_stat)
+            document_stats.append(document_stat)
+
+        shuffled = list(range(len(documents)))
+        rng.shuffle(shuffled)
+        merges = {
+            'forward': merge_all(corpus_stats, list(range(len(documents)))),
+            'reversed': merge_all(corpus_stats, list(reversed(range(len(documents))))),
+            'shuffled': merge_all(corpus_stats, shuffled),
+            'tree': merge_tree(corpus_stats),
+            'subtracted': add_incrementally(document_stats, rng.randrange(len(documents))),
+        }
+        for name, merged in merges.items():
+            differences = diff_corpus_stats(single_pass, exact, merged)
+            print(f'#{case} corpus-merge {name:<10} {"OK" if not differences else "MISMATCH"}')
+            for difference in differences:
+                print(f'    {difference}')
+            matched = matched and not differences
+    return matched
+
+
+def check_report(html_path: str, docx_path: str) -> list:
+    """
+    Describe what is wrong with the exported reports: the HTML one must be valid UTF-8,
+    and every XML part of the .docx must parse, or Word would not open it.
+    """
+    problems = []
+    try:
+        with open(html_path, encoding='utf-8') as f:
+            f.read()
+    except (OSError, UnicodeDecodeError) as err:
+        problems.append(f'html: {type(err).__name__}: {err}')
+    try:
+        with zipfile.ZipFile(docx_path) as archive:
+            for name in archive.namelist():
+                if name.endswith('.xml') or name.endswith('.rels'):
+                    try:
+                        ElementTree.fromstring(archive.read(name))
+                    except ElementTree.ParseError as err:
+                        problems.append(f'docx {name}: {err}')
+    except (OSError, zipfile.BadZipFile) as err:
+        problems.append(f'docx: {type(err).__name__}: {err}')
+    return problems
+
+
+def fuzz_exporters(
+    cases: int,
+    seed: int = 0,
+    generators: tuple = ('plain', 'markers', 'unicode', 'punctuation', 'control'),
+) -> bool:
+    """
+    Export generated texts to HTML and .docx, and check that the reports can be read back.
+    Returns True if all of them could.
+    """
+    rng = random.Random(seed)
+    matched = True
+    with tempfile.TemporaryDirectory() as directory:
+        html_path, docx_path = os.path.join(directory, 'report.html'), os.path.join(directory, 'report.docx')
+        for case in range(cases):
+            kind = rng.choice(generators)
+            text = GENERATORS[kind](rng)
+            try:
+                export_text(iter(text), [HtmlExporter(html_path), DocxExporter(docx_path)])
+                problems = check_report(html_path, docx_path)
+            except Exception as err:
+                problems = [f'raised {type(err).__name__}: {err}']
+            print(f'#{case} export {kind:<12} {"OK" if not problems else "BROKEN"}')
+            for problem in problems:
+                print(f'    {problem}')
+            matched = matched and not problems
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the text processing engines with the reference one.')
+    parser.add_argument('-n', '--cases', type=int, default=100, help='number of generated texts')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: %(default)s)')
+    parser.add_argument(
+        '-e', '--engines', nargs='+', choices=('current', 'streaming', 'cached', 'parallel'),
+        default=['current', 'streaming', 'cached', 'parallel'], help='engines to compare with the reference one'
+    )
+    parser.add_argument('--workers', type=int, default=4, help='number of processes for the parallel engine')
+    parser.add_argument(
+        '--corpus-cases', type=int, default=20, help='number of generated corpora to check CorpusStat merging on'
+    )
+    parser.add_argument(
+        '--export-cases', type=int, default=20, help='number of generated texts to check the report exporters on'
+    )
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        engines = {
+            'current': current_engine,
+            'streaming': streaming_engine,
+            'cached': cached_engine,
+            'parallel': partial(parallel_engine, executor=executor, workers=args.workers),
+        }
+        matched = fuzz({name: engines[name] for name in args.engines}, args.cases, args.seed)
+    matched = fuzz_corpus_merge(args.corpus_cases, args.seed) and matched
+    matched = fuzz_exporters(args.export_cases, args.seed) and matched
+    sys.exit(0 if matched else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+# A frozen copy of the English text processing flow, kept as the oracle for fuzzer.py.
+# It is written for clarity rather than speed, and has its own STAT, so optimizing text_processor.py
+# does not change it. Change it only when the expected results are meant to change.
+import re
+
+from util.word_lists import (
+    complex_phrases,
+    ly_words_not_adverbs,
+    passive_voice_pre_words,
+    qualifying_words,
+    qualifier_linkers,
+    sentence_starters,
+)
+from util.line_format import LineFormat
+from util.readability import Readability
+
+
+STAT = {
+    'total_sentences': 0,
+    'hard_sentences': 0,
+    'very_hard_sentences': 0,
+    'adverbs': 0,
+    'qualifiers': 0,
+    'passive_voice': 0,
+    'bad_start': 0,
+    'complex': 0,
+    'total_letters': 0,
+    'total_characters': 0,
+    'total_words': 0,
+    'total_syllables': 0,
+    'total_polysyllables': 0,
+    'total_paragraphs': 0
+}
+
+# characters that end a sentence, with the CJK, Devanagari and Arabic ones
+TERMINATORS = '\\.!?。！？।؟'
+
+
+def reset_stat() -> None:
+    """
+    Zero all text statistics before processing another text.
+    """
+    for key in STAT:
+        STAT[key] = 0
+
+
+def get_letters_in_sentence(sentence: str) -> list:
+    """
+    Return a list of letters to get the total number of them per sentence.
+    """
+    letters_pattern = re.compile(r'[^\W\d_]', re.M)
+    return letters_pattern.findall(sentence)
+
+
+def get_words_in_sentence(sentence: str) -> list:
+    """
+    Return a list of words to get the total number of them per sentence.
+    """
+    words_pattern = re.compile(r'[\w\u0300-\u036f\'’/-]+', re.M)
+    return words_pattern.findall(sentence)
+
+
+def get_syllables_in_word(word: str) -> int:
+    """
+    Estimate the number of syllables in the word: groups of vowels, without the silent endings. 0 if it has no letters.
+    """
+    word = ''.join(get_letters_in_sentence(word)).lower()
+    if not word:
+        return 0
+    syllables = len(re.findall(r'[aeiouy]+', word))
+    if word.endswith('e') and not word.endswith(('le', 'ee')):
+        syllables -= 1
+    elif word.endswith('ed') and not word.endswith(('ted', 'ded')):
+        syllables -= 1
+    elif word.endswith('es') and not word.endswith(('ses', 'zes', 'ces', 'ges', 'xes', 'shes', 'ches')):
+        syllables -= 1
+    return max(syllables, 1)
+
+
+def get_readability(words_in_sentence: int, reading_level: int) -> Readability:
+    """
+    Calculate the sentence's readability based on the number of words in sentence and reading level.
+    """
+    if words_in_sentence < 14:
+        return Readability.NORMAL
+    elif 10 <= reading_level <= 14:
+        return Readability.HARD
+    elif reading_level > 14:
+        return Readability.VERY_HARD
+    else:
+        return Readability.NORMAL
+
+
+def get_reading_level(letters_in_sentence: int, words_in_sentence: int) -> int:
+    """
+    Calculate the reading level of the sentence. Sentences without words are at level 0.
+    """
+    if words_in_sentence == 0:
+        return 0
+    return round(
+        4.71 * (letters_in_sentence / words_in_sentence)
+        + 0.5 * words_in_sentence
+        - 21.43
+    )
+
+
+def highlight(sentence: str, text_to_highlight: str, readability: Readability, line_format: str) -> str:
+    """
+    Apply formatting to the sentence's combination of words (or the whole sentence) based on its readability level.
+    """
+    if readability is not Readability.NORMAL:
+        sentence = sentence.replace(
+            text_to_highlight,
+            f'{LineFormat.map(LineFormat.ENDC, to="symbol")}'
+            f'{LineFormat.map(line_format, to="symbol")}{text_to_highlight}'
+            f'{LineFormat.map(LineFormat.ENDC, to="symbol")}'
+            f'{LineFormat.map(LineFormat.YELLOW if readability is Readability.HARD else LineFormat.RED, to="symbol")}'
+        )
+    else:
+        sentence = sentence.replace(
+            text_to_highlight,
+            f'{LineFormat.map(line_format, to="symbol")}'
+            f'{text_to_highlight}'
+            f'{LineFormat.map(LineFormat.ENDC, to="symbol")}'
+        )
+    return sentence
+
+
+def process_sentence(sentence: str) -> str:
+    """
+    Calculate statistics for the incoming sentence, apply coloring based on readability
+    """
+    letters_in_sentence = get_letters_in_sentence(sentence)
+    number_of_letters = len(letters_in_sentence)
+    words_in_sentence = get_words_in_sentence(sentence)
+    number_of_words = len(words_in_sentence)
+    syllables_in_words = [get_syllables_in_word(word) for word in words_in_sentence]
+
+    STAT['total_letters'] += number_of_letters
+    STAT['total_words'] += number_of_words
+    STAT['total_characters'] += len(sentence)
+    STAT['total_syllables'] += sum(syllables_in_words)
+    STAT['total_polysyllables'] += len([syllables for syllables in syllables_in_words if syllables >= 3])
+
+    reading_level = get_reading_level(number_of_letters, number_of_words)
+    readability = get_readability(number_of_words, reading_level)
+
+    # READABILITY COLORING
+    if readability is Readability.HARD:
+        STAT['hard_sentences'] += 1
+        sentence = (
+            f'{LineFormat.map(LineFormat.YELLOW, to="symbol")}'
+            f'{sentence}'
+            f'{LineFormat.map(LineFormat.ENDC, to="symbol")}'
+        )
+    elif readability is Readability.VERY_HARD:
+        STAT['very_hard_sentences'] += 1
+        sentence = (
+            f'{LineFormat.map(LineFormat.RED, to="symbol")}'
+            f'{sentence}'
+            f'{LineFormat.map(LineFormat.ENDC, to="symbol")}'
+        )
+
+    for i, word in enumerate(words_in_sentence):
+        # ADVERBS COLORING
+        if word.lower().endswith('ly') and word.lower() not in ly_words_not_adverbs:
+            STAT['adverbs'] += 1
+            sentence = highlight(sentence, word, readability, LineFormat.CYAN)
+
+        # QUALIFYING WORDS COLORING
+        elif word.lower() in qualifying_words:
+            phrase_to_highlight = ''
+            # if the word is in the list of qualifying words, we need to check it
+            if qualifying_words[word.lower()]:
+                # if the previous word is a linker (was, were, don't, will)
+                if i > 0 and words_in_sentence[i - 1].lower() in qualifier_linkers:
+                    # if there was a pronoun before
+                    if i > 1 and words_in_sentence[i - 2].lower() in qualifying_words[word.lower()]:
+                        phrase_to_highlight = f'{words_in_sentence[i - 2]} {words_in_sentence[i - 1]} {word}'
+                # if the previous word is a pronoun
+                elif i > 0 and words_in_sentence[i - 1].lower() in qualifying_words[word.lower()]:
+                    phrase_to_highlight = f'{words_in_sentence[i - 1]} {word}'
+            else:
+                phrase_to_highlight = f'{word}'
+
+            if phrase_to_highlight:
+                STAT['qualifiers'] += 1
+                sentence = highlight(sentence, phrase_to_highlight, readability, LineFormat.CYAN)
+
+        # PASSIVE VOICE COLORING
+        if word.lower().endswith('ed') and words_in_sentence[i - 1].lower() in passive_voice_pre_words:
+            STAT['passive_voice'] += 1
+            phrase_to_highlight = f'{words_in_sentence[i - 1]} {word}'
+            sentence = highlight(sentence, phrase_to_highlight, readability, LineFormat.GREEN)
+
+    # COMPLEX WORDS
+    for complex_phrase in complex_phrases:
+        if complex_phrase in sentence:
+            STAT['complex'] += 1
+            sentence = highlight(sentence, complex_phrase, readability, LineFormat.PURPLE)
+
+    # SENTENCE STARTERS
+    for sentence_starter in sentence_starters:
+        if sentence.startswith(sentence_starter):
+            STAT['bad_start'] += 1
+            sentence = highlight(sentence, sentence_starter, readability, LineFormat.GREEN)
+
+    return sentence
+
+
+def get_sentences(paragraph: str) -> list:
+    """
+    Split the paragraph into sentences to process them.
+    A sentence runs from an uppercase letter, or a letter of a script without case, up to the nearest terminator.
+    """
+    sentences = []
+    start = None
+    for i, char in enumerate(paragraph):
+        if start is None:
+            if char.isupper() or (char.isalpha() and not char.islower()):
+                start = i
+        elif char in TERMINATORS:
+            sentences.append(paragraph[start:i + 1])
+            start = None
+    return sentences if sentences else [paragraph]
+
+
+def process_paragraph(paragraph: str) -> str:
+    """
+    Process single paragraph from the text.
+    """
+    processed_paragraph = ''
+    sentences = get_sentences(paragraph)
+
+    STAT['total_sentences'] += len(sentences)
+
+    for sentence in sentences:
+        processed_sentence = process_sentence(sentence)
+        processed_paragraph += ' ' + processed_sentence
+
+    return processed_paragraph
+
+
+def process_text(text: list) -> tuple:
+    """
+    The whole text processing flow, paragraph by paragraph.
+    Returns the processed text with formatting, and calculated text statistics.
+    """
+    STAT['total_paragraphs'] = len(list(filter(lambda p: p != '', text)))
+
+    processed_text = []
+    for paragraph in text:
+        processed_paragraph = process_paragraph(paragraph) if paragraph != '' else ''
+        processed_text.append(processed_paragraph)
+
+    return processed_text, STAT
@@ -9,11 +9,42 @@ from text_processor import (
     print_text,
     print_stat,
 )
+from exporter import (
+    DocxExporter,
+    HtmlExporter,
+    export_text,
+)
+from sampler import (
+    print_estimates,
+    sample_text,
+)
+from watcher import (
+    scan,
+    watch,
+)
 from util.file import (
     is_path,
     get_file_contents,
+    iter_file_contents,
+)
+from util.exceptions import FilepathNotProvidedError
+from util.file_index import FileIndex
+from util.metrics import READING_METRICS
+from util.language import (
+    AUTO_LANGUAGE,
+    DEFAULT_LANGUAGE,
+    LANGUAGES,
+    get_profile,
 )
-from util.word_lists import complex_phrases
+
+
+def positive_int(value: str) -> int:
+    """
+    Check if the argument is a whole number greater than zero.
+    """
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError(f'must be a positive integer: {value}')
+    return int(value)
 
 
 def main():
@@ -27,17 +58,125 @@ def main():
         parser.add_argument(
             '--example', action='store_true', help='use an example file to demonstrate the power of remarq'
         )
+        parser.add_argument(
+            '-m', '--metrics', nargs='+', choices=READING_METRICS, default=['ari'],
+            help='reading level metrics to show in the statistics'
+        )
+        modes = parser.add_argument_group(
+            'modes', 'use one of them instead of printing the text (only --html and --docx can be combined)'
+        )
+        modes.add_argument(
+            '--scan', metavar='DIR', type=is_path, help='analyze all new and changed files in the directory tree'
+        )
+        parser.add_argument(
+            '--watch', action='store_true', help='keep re-analyzing files in the --scan directory as they change'
+        )
+        parser.add_argument(
+            '--index', default='.remarq_index.json', help='specify the file index path for --scan (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--corpus', metavar='PATH',
+            help='with --scan, also save corpus-level statistics of all indexed files to PATH '
+                 '(with --watch, once watching stops)'
+        )
+        modes.add_argument(
+            '--html', metavar='PATH', help='write a self-contained HTML report instead of printing the text'
+        )
+        modes.add_argument(
+            '--docx', metavar='PATH', help='write a .docx with coloured highlights and comments instead of printing the text'
+        )
+        modes.add_argument(
+            '--sample', metavar='N', type=positive_int,
+            help='estimate the statistics from a random sample of at most N paragraphs instead of the whole text'
+        )
+        parser.add_argument(
+            '--precision', type=float, default=0.05,
+            help='stop sampling once confidence intervals are within this fraction of the estimates (default: %(default)s)'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0, help='random seed for --sample (default: %(default)s)'
+        )
+        modes.add_argument(
+            '--view', action='store_true', help='open the text in an interactive viewer that analyzes it as you scroll'
+        )
+        parser.add_argument(
+            '-l', '--language', choices=[AUTO_LANGUAGE, *LANGUAGES], default=DEFAULT_LANGUAGE,
+            help='language of the text, or auto to detect it for every paragraph (default: %(default)s)'
+        )
         args = parser.parse_args()
+        selected_modes = [
+            name for name, selected in (
+                ('--scan', args.scan),
+                ('--sample', args.sample is not None),
+                ('--html/--docx', args.html or args.docx),
+                ('--view', args.view),
+            ) if selected
+        ]
+        if len(selected_modes) > 1:
+            parser.error(f'{" and ".join(selected_modes)} cannot be used together')
+        if (args.watch or args.corpus) and not args.scan:
+            parser.error('--watch and --corpus can only be used with --scan')
+
+        if args.scan:
+            index = FileIndex(args.index)
+            if args.watch:
+                try:
+                    watch(args.scan, index, language=args.language, with_corpus=bool(args.corpus))
+                except KeyboardInterrupt:
+                    if not args.corpus:
+                        raise
+            else:
+                changes = scan(args.scan, index, language=args.language, with_corpus=bool(args.corpus))
+                total = index.total_stat()
+                print(
+                    f'{changes} changed out of {len(index.entries)} indexed files. '
+                    f'{total.get("hard_sentences", 0) + total.get("very_hard_sentences", 0)} out of '
+                    f'{total.get("total_sentences", 0)} sentences are hard to read.'
+                )
+            if args.corpus:
+                corpus_stat = index.total_corpus_stat()
+                corpus_stat.save(args.corpus)
+                print('\n'.join(corpus_stat.summary()))
+            return
 
         filepath = 'example.txt' if args.example else args.path
+        if args.sample is not None:
+            if not filepath:
+                raise FilepathNotProvidedError
+            estimates, number_of_paragraphs = sample_text(
+                filepath, args.sample, args.precision, seed=args.seed, language=args.language
+            )
+            print_estimates(estimates, number_of_paragraphs)
+            return
+
+        if args.html or args.docx:
+            if not filepath:
+                raise FilepathNotProvidedError
+            exporters = []
+            if args.html:
+                exporters.append(HtmlExporter(args.html))
+            if args.docx:
+                exporters.append(DocxExporter(args.docx))
+            export_text(iter_file_contents(filepath), exporters, args.metrics, args.language)
+            print(f'Report written to {", ".join(path for path in (args.html, args.docx) if path)}')
+            return
+
         text = get_file_contents(filepath)
+        if args.view:
+            # curses is not available everywhere (e.g. on Windows), so it is only imported when needed
+            from viewer import view
+            view(text, filepath, args.language)
+            return
 
         start_time = time.time()
-        processed_text, text_stat = process_text(text)
+        processed_text, text_stat = process_text(text, language=args.language)
         print_text(processed_text)
-        print_stat()
+        print_stat(args.metrics, args.language)
         print("--- %s seconds ---" % (time.time() - start_time))
 
+        complex_phrases = get_profile(
+            DEFAULT_LANGUAGE if args.language == AUTO_LANGUAGE else args.language
+        ).complex_phrases
         # TODO(redd4ford): provide better CLI
         while True:
             try:
@@ -0,0 +1,153 @@
+import math
+import os
+import random
+from statistics import NormalDist
+
+from text_processor import (
+    STAT,
+    process_paragraph,
+    reset_stat,
+)
+from util.file import iter_file_contents
+from util.language import DEFAULT_LANGUAGE
+
+
+# name, STAT keys summed up for the numerator, STAT key of the denominator, scale
+RATES = (
+    ('Hard to read sentences, %', ('hard_sentences', 'very_hard_sentences'), 'total_sentences', 100),
+    ('Very hard to read sentences, %', ('very_hard_sentences',), 'total_sentences', 100),
+    ('Cliché sentence openers, %', ('bad_start',), 'total_sentences', 100),
+    ('Passive voice per 1k words', ('passive_voice',), 'total_words', 1000),
+    ('Adverbs per 1k words', ('adverbs',), 'total_words', 1000),
+    ('Qualifiers per 1k words', ('qualifiers',), 'total_words', 1000),
+    ('Complex phrases per 1k words', ('complex',), 'total_words', 1000),
+    ('Words per sentence', ('total_words',), 'total_sentences', 1),
+)
+
+# number of paragraphs to process before checking the precision
+MIN_SAMPLE = 30
+BATCH = 10
+
+
+def seek_paragraphs(filepath: str, rng: random.Random):
+    """
+    Endlessly yield (weight, paragraph) for the lines found at random offsets of a text file.
+    Lines are picked with probability proportional to their length, so the weight is the inverse of it.
+    """
+    size = os.path.getsize(filepath)
+    if not size:
+        return
+    with open(filepath, 'rb') as f:
+        while True:
+            offset = rng.randrange(size)
+            # step back to the start of the line containing the offset
+            start = offset
+            while start > 0:
+                block_start = max(start - 4096, 0)
+                f.seek(block_start)
+                newline = f.read(start - block_start).rfind(b'\n')
+                if newline >= 0:
+                    start = block_start + newline + 1
+                    break
+                start = block_start
+            f.seek(start)
+            line = f.readline()
+            yield 1 / len(line), line.decode('utf-8', errors='replace').strip()
+
+
+def reservoir_paragraphs(paragraphs, size: int, rng: random.Random):
+    """
+    Yield (weight, paragraph) for a uniform random sample of the given size, drawn from a stream in a single pass.
+    """
+    reservoir = []
+    for i, paragraph in enumerate(paragraphs):
+        if i < size:
+            reservoir.append(paragraph)
+        else:
+            j = rng.randrange(i + 1)
+            if j < size:
+                reservoir[j] = paragraph
+    rng.shuffle(reservoir)
+    for paragraph in reservoir:
+        yield 1, paragraph
+
+
+def estimate_rates(samples: list, confidence: float = 0.95) -> dict:
+    """
+    Estimate RATES from (weight, paragraph statistics) samples.
+    Returns a dict of rate name -> (estimate, half-width of the confidence interval).
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    n = len(samples)
+    estimates = {}
+    for name, numerator_keys, denominator_key, scale in RATES:
+        numerators = [weight * sum(stat[key] for key in numerator_keys) for weight, stat in samples]
+        denominators = [weight * stat[denominator_key] for weight, stat in samples]
+        total = sum(denominators)
+        if not total:
+            estimates[name] = (0.0, 0.0)
+            continue
+        ratio = sum(numerators) / total
+        # variance of a ratio estimator, by linearization
+        residuals = sum((y - ratio * x) ** 2 for y, x in zip(numerators, denominators))
+        variance = n / (n - 1) * residuals / total ** 2 if n > 1 else math.inf
+        estimates[name] = (ratio * scale, z * math.sqrt(variance) * scale)
+    return estimates
+
+
+def is_precise(estimates: dict, precision: float) -> bool:
+    """
+    Check if every confidence interval is within the relative precision of its estimate.
+    """
+    return all(half_width <= precision * abs(estimate) for estimate, half_width in estimates.values())
+
+
+def sample_text(
+    filepath: str,
+    max_paragraphs: int,
+    precision: float = 0.05,
+    confidence: float = 0.95,
+    seed: int = 0,
+    language: str = DEFAULT_LANGUAGE,
+) -> tuple:
+    """
+    Process a reproducible random sample of the file's paragraphs with process_paragraph.
+    Stops early once the confidence intervals of all rates are within the relative precision.
+    Returns the estimates (see estimate_rates) and the number of processed paragraphs.
+    """
+    rng = random.Random(seed)
+    if filepath.endswith('.docx'):
+        paragraphs = reservoir_paragraphs(iter_file_contents(filepath), max_paragraphs, rng)
+    else:
+        paragraphs = seek_paragraphs(filepath, rng)
+
+    samples = []
+    estimates = {}
+    reset_stat()
+    # empty lines are drawn but not counted, so give up if the file is (almost) all of them
+    for draws, (weight, paragraph) in enumerate(paragraphs):
+        if len(samples) >= max_paragraphs or draws >= max_paragraphs * 10:
+            break
+        if paragraph == '':
+            continue
+        before = dict(STAT)
+        process_paragraph(paragraph, language=language)
+        samples.append((weight, {key: STAT[key] - before[key] for key in STAT}))
+
+        if len(samples) >= MIN_SAMPLE and len(samples) % BATCH == 0:
+            estimates = estimate_rates(samples, confidence)
+            if is_precise(estimates, precision):
+                break
+
+    if samples:
+        estimates = estimate_rates(samples, confidence)
+    return estimates, len(samples)
+
+
+def print_estimates(estimates: dict, number_of_paragraphs: int, confidence: float = 0.95) -> None:
+    """
+    Print the estimated rates with their confidence intervals.
+    """
+    print(f'Estimated from {number_of_paragraphs} sampled paragraphs ({confidence:.0%} confidence):')
+    for name, (estimate, half_width) in estimates.items():
+        print(f'{name}: {estimate:.2f} ± {half_width:.2f}')
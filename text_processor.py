@@ -2,16 +2,21 @@ import os
 import re
 from textwrap import TextWrapper
 
-from util.word_lists import (
-    complex_phrases,
-    ly_words_not_adverbs,
-    passive_voice_pre_words,
-    qualifying_words,
-    qualifier_linkers,
-    sentence_starters,
+from util.corpus_stat import CorpusStat
+from util.language import (
+    DEFAULT_LANGUAGE,
+    get_profile,
+    get_sentence_pattern,
+    resolve_language,
 )
 from util.line_format import LineFormat
+from util.metrics import (
+    READING_METRICS,
+    get_reading_levels,
+    get_sentence_counts,
+)
 from util.readability import Readability
+from util.results import SentenceResults
 
 
 STAT = {
@@ -26,23 +31,25 @@ STAT = {
     'total_letters': 0,
     'total_characters': 0,
     'total_words': 0,
+    'total_syllables': 0,
+    'total_polysyllables': 0,
     'total_paragraphs': 0
 }
 
 
-def get_letters_in_sentence(sentence: str) -> list:
+def reset_stat() -> None:
     """
-    Return a list of letters to get the total number of them per sentence.
+    Zero all text statistics before processing another document.
     """
-    letters_pattern = re.compile(r'[A-Za-z]', re.M)
-    return letters_pattern.findall(sentence)
+    for key in STAT:
+        STAT[key] = 0
 
 
 def get_words_in_sentence(sentence: str) -> list:
     """
     Return a list of words to get the total number of them per sentence.
     """
-    words_pattern = re.compile(r'[\w\'/-]+', re.M)
+    words_pattern = re.compile(r'[\w\u0300-\u036f\'’/-]+', re.M)
     return words_pattern.findall(sentence)
 
 
@@ -62,8 +69,11 @@ def get_readability(words_in_sentence: int, reading_level: int) -> Readability:
 
 def get_reading_level(letters_in_sentence: int, words_in_sentence: int) -> int:
     """
-    Calculate the reading level of the sentence.
+    Calculate the reading level of the sentence. Sentences without words (e.g. '***' or '====') are at level 0.
+    The formula's constants are the English ones, for all languages.
     """
+    if words_in_sentence == 0:
+        return 0
     return round(
         4.71 * (letters_in_sentence / words_in_sentence)
         + 0.5 * words_in_sentence
@@ -93,21 +103,33 @@ def highlight(sentence: str, text_to_highlight: str, readability: Readability, l
     return sentence
 
 
-def process_sentence(sentence: str) -> str:
+def process_sentence(
+    sentence: str,
+    corpus_stat: CorpusStat = None,
+    results: SentenceResults = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> str:
     """
     Calculate statistics for the incoming sentence, apply coloring based on readability
     """
-    letters_in_sentence = get_letters_in_sentence(sentence)
-    number_of_letters = len(letters_in_sentence)
+    profile = get_profile(language)
+    plain_sentence = sentence
     words_in_sentence = get_words_in_sentence(sentence)
     number_of_words = len(words_in_sentence)
+    number_of_characters = len(sentence)
+    # letters and syllables for all the reading level metrics, counted in one pass over the words
+    number_of_letters, number_of_syllables, number_of_polysyllables = get_sentence_counts(words_in_sentence, language)
 
     STAT['total_letters'] += number_of_letters
     STAT['total_words'] += number_of_words
-    STAT['total_characters'] += len(sentence)
+    STAT['total_characters'] += number_of_characters
+    STAT['total_syllables'] += number_of_syllables
+    STAT['total_polysyllables'] += number_of_polysyllables
 
     reading_level = get_reading_level(number_of_letters, number_of_words)
     readability = get_readability(number_of_words, reading_level)
+    # phrases found in the sentence, by STAT key
+    found = {'adverbs': [], 'qualifiers': [], 'passive_voice': [], 'complex': [], 'bad_start': []}
 
     # READABILITY COLORING
     if readability is Readability.HARD:
@@ -127,86 +149,131 @@ def process_sentence(sentence: str) -> str:
 
     for i, word in enumerate(words_in_sentence):
         # ADVERBS COLORING
-        if word.lower().endswith('ly') and word.lower() not in ly_words_not_adverbs:
-            STAT['adverbs'] += 1
+        if word.lower().endswith(profile.adverb_suffixes) and word.lower() not in profile.not_adverbs:
+            found['adverbs'].append(word)
             sentence = highlight(sentence, word, readability, LineFormat.CYAN)
 
         # QUALIFYING WORDS COLORING
-        elif word.lower() in qualifying_words:
+        elif word.lower() in profile.qualifying_words:
             phrase_to_highlight = ''
             # if the word is in the list of qualifying words, we need to check it
-            if qualifying_words[word.lower()]:
+            if profile.qualifying_words[word.lower()]:
                 # if the previous word is a linker (was, were, don't, will)
-                if i > 0 and words_in_sentence[i - 1].lower() in qualifier_linkers:
+                if i > 0 and words_in_sentence[i - 1].lower() in profile.qualifier_linkers:
                     # if there was a pronoun before
-                    if i > 1 and words_in_sentence[i - 2].lower() in qualifying_words[word.lower()]:
+                    if i > 1 and words_in_sentence[i - 2].lower() in profile.qualifying_words[word.lower()]:
                         phrase_to_highlight = f'{words_in_sentence[i - 2]} {words_in_sentence[i - 1]} {word}'
                 # if the previous word is a pronoun
-                elif i > 0 and words_in_sentence[i - 1].lower() in qualifying_words[word.lower()]:
+                elif i > 0 and words_in_sentence[i - 1].lower() in profile.qualifying_words[word.lower()]:
                     phrase_to_highlight = f'{words_in_sentence[i - 1]} {word}'
             else:
                 phrase_to_highlight = f'{word}'
 
             if phrase_to_highlight:
-                STAT['qualifiers'] += 1
+                found['qualifiers'].append(phrase_to_highlight)
                 sentence = highlight(sentence, phrase_to_highlight, readability, LineFormat.CYAN)
 
         # PASSIVE VOICE COLORING
-        if word.lower().endswith('ed') and words_in_sentence[i - 1].lower() in passive_voice_pre_words:
-            STAT['passive_voice'] += 1
+        if (
+            word.lower().endswith(profile.participle_suffixes)
+            and words_in_sentence[i - 1].lower() in profile.passive_voice_pre_words
+            and word.lower() not in profile.not_participles
+            and (profile.participle_pattern is None or profile.participle_pattern.fullmatch(word))
+        ):
             phrase_to_highlight = f'{words_in_sentence[i - 1]} {word}'
+            found['passive_voice'].append(phrase_to_highlight)
             sentence = highlight(sentence, phrase_to_highlight, readability, LineFormat.GREEN)
 
     # COMPLEX WORDS
-    for complex_phrase in complex_phrases:
+    for complex_phrase in profile.complex_phrases:
         if complex_phrase in sentence:
-            STAT['complex'] += 1
+            found['complex'].append(complex_phrase)
             sentence = highlight(sentence, complex_phrase, readability, LineFormat.PURPLE)
 
     # SENTENCE STARTERS
-    for sentence_starter in sentence_starters:
+    for sentence_starter in profile.sentence_starters:
         if sentence.startswith(sentence_starter):
-            STAT['bad_start'] += 1
+            found['bad_start'].append(sentence_starter)
             sentence = highlight(sentence, sentence_starter, readability, LineFormat.GREEN)
 
+    for key, phrases in found.items():
+        STAT[key] += len(phrases)
+
+    if corpus_stat is not None:
+        corpus_stat.add_sentence(
+            number_of_letters,
+            number_of_words,
+            number_of_characters,
+            number_of_syllables,
+            number_of_polysyllables,
+            reading_level,
+            readability,
+            found,
+        )
+    if results is not None:
+        results.add_sentence(plain_sentence, number_of_words, reading_level, readability, found)
+
     return sentence
 
 
-def get_sentences(paragraph: str) -> list:
+def get_sentences(paragraph: str, language: str = DEFAULT_LANGUAGE) -> list:
     """
     Split the paragraph into sentences to process them.
     """
-    sentence_pattern = re.compile(r'([A-Z][^\\.!?]*[\\.!?])', re.M)
-    sentences = sentence_pattern.findall(paragraph)
+    sentences = get_sentence_pattern(language).findall(paragraph)
     return sentences if sentences else [paragraph]
 
 
-def process_paragraph(paragraph: str) -> str:
+def process_paragraph(
+    paragraph: str,
+    corpus_stat: CorpusStat = None,
+    results: SentenceResults = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> str:
     """
     Process single paragraph from the text.
+    With language 'auto', the paragraph's language is detected first.
     """
     processed_paragraph = ''
-    sentences = get_sentences(paragraph)
+    if results is not None:
+        results.begin_paragraph(paragraph)
+    language = resolve_language(language, paragraph)
+    sentences = get_sentences(paragraph, language)
 
     STAT['total_sentences'] += len(sentences)
 
     for sentence in sentences:
-        processed_sentence = process_sentence(sentence)
+        processed_sentence = process_sentence(sentence, corpus_stat, results, language)
         processed_paragraph += ' ' + processed_sentence
 
     return processed_paragraph
 
 
-def process_text(text: list) -> tuple:
+def process_text(
+    text: list,
+    corpus_stat: CorpusStat = None,
+    results: SentenceResults = None,
+    language: str = DEFAULT_LANGUAGE,
+) -> tuple:
     """
     The whole text processing flow, paragraph by paragraph.
     Returns the processed text with formatting, and calculated text statistics.
+    If corpus_stat is provided, the text is also added to these corpus-level aggregates.
+    If results is provided, per-sentence results are stored in it.
+    Language profiles are loaded on first use; with language 'auto', it is detected for every paragraph.
     """
     STAT['total_paragraphs'] = len(list(filter(lambda p: p != '', text)))
+    if corpus_stat is not None:
+        corpus_stat.add_document(STAT['total_paragraphs'])
 
     processed_text = []
     for paragraph in text:
-        processed_paragraph = process_paragraph(paragraph) if paragraph != '' else ''
+        if paragraph != '':
+            processed_paragraph = process_paragraph(paragraph, corpus_stat, results, language)
+        else:
+            processed_paragraph = ''
+            if results is not None:
+                results.skip_paragraph()
         processed_text.append(processed_paragraph)
 
     return processed_text, STAT
@@ -226,13 +293,62 @@ def print_text(text: list) -> None:
         print(paragraph)
 
 
-def print_stat() -> None:
+def get_stat_summary(stat: dict, metrics: tuple = ('ari',), language: str = DEFAULT_LANGUAGE) -> list:
+    """
+    Return the text statistics summary as a list of (LineFormat color or None, text, suffix) lines,
+    where only the text is coloured. Empty lines separate the groups.
+    Used both for the terminal output and for the exported reports.
+    """
+    summary = [
+        (None, f'Paragraphs: {stat["total_paragraphs"]}', ''),
+        (None, f'Sentences: {stat["total_sentences"]}', ''),
+        (None, f'Words: {stat["total_words"]}', ''),
+        (None, f'Characters: {stat["total_characters"]} ({stat["total_letters"]} letters)', ''),
+        (None, '', ''),
+    ]
+    for metric, level in get_reading_levels(stat, metrics, language).items():
+        summary.append((None, f'{READING_METRICS[metric][0]}: {level:.1f}', ''))
+    summary += [
+        (None, '', ''),
+        (
+            LineFormat.YELLOW,
+            f'{stat["hard_sentences"]} out of {stat["total_sentences"]} sentences are hard to read',
+            '.',
+        ),
+        (
+            LineFormat.RED,
+            f'{stat["very_hard_sentences"]} out of {stat["total_sentences"]} sentences are very hard to read',
+            '.',
+        ),
+        (None, 'Found:', ''),
+        (
+            LineFormat.GREEN,
+            f'- {stat["bad_start"]} cliché sentence openers',
+            '. Rebuild the sentence to avoid them.' if stat['bad_start'] > 0 else '.',
+        ),
+        (
+            LineFormat.GREEN,
+            f'- {stat["passive_voice"]} uses of passive voice',
+            '. Use active voice instead.' if stat['passive_voice'] > 0 else '.',
+        ),
+        (
+            LineFormat.CYAN,
+            f'- {stat["adverbs"]} adverbs & {stat["qualifiers"]} qualifiers',
+            f'. Try to use {stat["total_paragraphs"] // 3} or less.' if stat['qualifiers'] > 0 else '.',
+        ),
+        (LineFormat.PURPLE, f'- {stat["complex"]} phrases have simpler alternatives', '.'),
+    ]
+    return summary
+
+
+def print_stat(metrics: tuple = ('ari',), language: str = DEFAULT_LANGUAGE) -> None:
     """
     Prints text statistics in the following order:
         - Total paragraphs found;
         - Total sentences found;
         - Total words found;
         - Total characters and letters found;
+        - Reading level by each of the selected metrics;
         - Number of sentences that are hard to read;
         - Number of sentences that are very hard to read;
         - Number of sentences with a bad start;
@@ -240,26 +356,7 @@ def print_stat() -> None:
         - Number of adverbs and qualifier words found;
         - Number of phrases that have simpler alternatives.
     """
-    print(
-        f'\n\n====================================\n\n'
-        f'Paragraphs: {STAT["total_paragraphs"]}\n'
-        f'Sentences: {STAT["total_sentences"]}\n'
-        f'Words: {STAT["total_words"]}\n'
-        f'Characters: {STAT["total_characters"]} ({STAT["total_letters"]} letters)\n'
-        f'\n'
-        f'{STAT["hard_sentences"]} out of {STAT["total_sentences"]} sentences are '
-        f'{LineFormat.YELLOW}hard to read{LineFormat.ENDC}.\n'
-        f'{STAT["very_hard_sentences"]} out of {STAT["total_sentences"]} sentences are '
-        f'{LineFormat.RED}very hard to read{LineFormat.ENDC}.\n'
-        f'Found:\n'
-        f'{LineFormat.GREEN}- {STAT["bad_start"]} cliché sentence openers{LineFormat.ENDC}. ' +
-        f'{"Rebuild the sentence to avoid them." if STAT["bad_start"] > 0 else ""}\n'
-        f'{LineFormat.GREEN}- {STAT["passive_voice"]} uses of passive voice{LineFormat.ENDC}. '
-        f'{"Use active voice instead." if STAT["passive_voice"] > 0 else ""}\n'
-        f'{LineFormat.CYAN}- {STAT["adverbs"]} adverbs & '
-        f'{STAT["qualifiers"]} qualifiers{LineFormat.ENDC}. '
-        f'{("Try to use " + str(STAT["total_paragraphs"] // 3) + " or less.") if STAT["qualifiers"] > 0 else ""}'
-        f'\n'
-        f'{LineFormat.PURPLE}- {STAT["complex"]} phrases have simpler alternatives{LineFormat.ENDC}. '
-        f'{"Enter the phrases to find replacement recommendations:" if STAT["complex"] > 0 else ""}\n\n'
-    )
+    print('\n\n====================================\n')
+    for line_format, text, suffix in get_stat_summary(STAT, metrics, language):
+        print(f'{line_format}{text}{LineFormat.ENDC}{suffix}' if line_format else f'{text}{suffix}')
+    print(f'{"Enter the phrases to find replacement recommendations:" if STAT["complex"] > 0 else ""}\n')
@@ -0,0 +1,291 @@
+import json
+import os
+
+from util.readability import Readability
+from util.sketches import (
+    CountMinSketch,
+    Histogram,
+    QuantileSketch,
+    SpaceSaving,
+)
+
+
+class CorpusStat:
+    """
+    Mergeable text statistics for a whole corpus.
+    Holds exact counters (same keys as the per-document STAT) and fixed-memory sketches,
+    so the memory used does not depend on the number of processed documents.
+    Objects filled by parallel workers or separate runs can be combined with merge() in any order.
+    """
+    COUNTERS = (
+        'total_documents',
+        'total_paragraphs',
+        'total_sentences',
+        'hard_sentences',
+        'very_hard_sentences',
+        'adverbs',
+        'qualifiers',
+        'passive_voice',
+        'bad_start',
+        'complex',
+        'total_letters',
+        'total_characters',
+        'total_words',
+        'total_syllables',
+        'total_polysyllables',
+    )
+
+    def __init__(self, top_k: int = 50):
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        # distribution of sentence reading levels
+        self.reading_levels = Histogram()
+        # distribution of sentence lengths, in words
+        self.sentence_lengths = QuantileSketch()
+        # frequency of any found phrase, keyed by '<STAT key>:<phrase>'
+        self.phrases = CountMinSketch()
+        self.top_complex = SpaceSaving(top_k)
+        self.top_adverbs = SpaceSaving(top_k)
+        self.top_openers = SpaceSaving(top_k)
+
+    @property
+    def trackers(self) -> dict:
+        """
+        Top-K trackers by the STAT key of the phrases they count.
+        """
+        return {'complex': self.top_complex, 'adverbs': self.top_adverbs, 'bad_start': self.top_openers}
+
+    def add_document(self, number_of_paragraphs: int) -> None:
+        """
+        Count a new document with its non-empty paragraphs.
+        """
+        self.counters['total_documents'] += 1
+        self.counters['total_paragraphs'] += number_of_paragraphs
+
+    def add_sentence(
+        self,
+        number_of_letters: int,
+        number_of_words: int,
+        number_of_characters: int,
+        number_of_syllables: int,
+        number_of_polysyllables: int,
+        reading_level: int,
+        readability: Readability,
+        found: dict,
+    ) -> None:
+        """
+        Count a processed sentence. `found` maps STAT keys (adverbs, qualifiers, passive_voice, complex, bad_start)
+        to the lists of phrases found in the sentence.
+        """
+        self.counters['total_sentences'] += 1
+        self.counters['total_letters'] += number_of_letters
+        self.counters['total_words'] += number_of_words
+        self.counters['total_characters'] += number_of_characters
+        self.counters['total_syllables'] += number_of_syllables
+        self.counters['total_polysyllables'] += number_of_polysyllables
+        if readability is Readability.HARD:
+            self.counters['hard_sentences'] += 1
+        elif readability is Readability.VERY_HARD:
+            self.counters['very_hard_sentences'] += 1
+
+        self.reading_levels.add(reading_level)
+        self.sentence_lengths.add(number_of_words)
+
+        for key, phrases in found.items():
+            self.counters[key] += len(phrases)
+            for phrase in phrases:
+                self.phrases.add(f'{key}:{phrase.lower()}')
+        for phrase in found.get('complex', []):
+            self.top_complex.add(phrase.lower())
+        for word in found.get('adverbs', []):
+            self.top_adverbs.add(word.lower())
+        for opener in found.get('bad_start', []):
+            self.top_openers.add(opener.lower())
+
+    def merge(self, other: 'CorpusStat') -> 'CorpusStat':
+        """
+        Add the other object's statistics to this one.
+        """
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        self.reading_levels.merge(other.reading_levels)
+        self.sentence_lengths.merge(other.sentence_lengths)
+        self.phrases.merge(other.phrases)
+        self.top_complex.merge(other.top_complex)
+        self.top_adverbs.merge(other.top_adverbs)
+        self.top_openers.merge(other.top_openers)
+        return self
+
+    def add(self, document: 'DocumentStat', sign: int = 1) -> 'CorpusStat':
+        """
+        Add the document's statistics to this one, or take them away again with sign=-1.
+        Counters, the histogram and both sketches are linear, so this costs only as much as the document is big.
+        Top-K trackers are not updated: see rebuild_trackers().
+        """
+        for key, value in document.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + sign * value
+        for level, count in document.reading_levels.items():
+            self.reading_levels.add(level, sign * count)
+        for length, count in document.sentence_lengths.items():
+            self.sentence_lengths.add(length, sign * count)
+        for phrase, count in document.phrases.items():
+            self.phrases.add(phrase, sign * count)
+        return self
+
+    def subtract(self, document: 'DocumentStat') -> 'CorpusStat':
+        return self.add(document, -1)
+
+    def rebuild_trackers(self, documents) -> 'CorpusStat':
+        """
+        Refill the top-K trackers from the phrases of all the documents that were added.
+        """
+        for tracker in self.trackers.values():
+            tracker.counters = {}
+        for document in documents:
+            for phrase, count in document.phrases.items():
+                key, phrase = phrase.split(':', 1)
+                if key in self.trackers:
+                    self.trackers[key].add(phrase, count)
+        return self
+
+    def phrase_count(self, key: str, phrase: str) -> int:
+        """
+        Return the estimated number of times the phrase was found under the STAT key (e.g. 'complex').
+        """
+        return self.phrases.estimate(f'{key}:{phrase.lower()}')
+
+    def top(self, key: str, n: int = 10) -> list:
+        """
+        Return up to n (phrase, estimated count) pairs of the most frequent phrases under the STAT key
+        ('complex', 'adverbs' or 'bad_start'). Both sketches only overcount, so the lower of their estimates is used.
+        """
+        ranked = [
+            (phrase, min(count, self.phrase_count(key, phrase)))
+            for phrase, count in self.trackers[key].top(n)
+        ]
+        return sorted(ranked, key=lambda pair: (-pair[1], pair[0]))
+
+    def summary(self, n: int = 5) -> list:
+        """
+        Return a short human-readable summary as a list of lines.
+        """
+        lines = [
+            f'Documents: {self.counters["total_documents"]}',
+            f'Sentences: {self.counters["total_sentences"]}',
+            f'Words: {self.counters["total_words"]}',
+            f'Sentence length, words: median {self.sentence_lengths.quantile(0.5):.0f}, '
+            f'90th percentile {self.sentence_lengths.quantile(0.9):.0f}',
+            f'Reading levels: {", ".join(f"{level}: {count}" for level, count in self.reading_levels.items())}',
+        ]
+        for key, title in (('complex', 'Complex phrases'), ('adverbs', 'Adverbs'), ('bad_start', 'Sentence openers')):
+            top = self.top(key, n)
+            lines.append(f'{title}: {", ".join(f"{phrase} ({count})" for phrase, count in top) or "none"}')
+        return lines
+
+    def to_dict(self) -> dict:
+        return {
+            'counters': dict(self.counters),
+            'reading_levels': self.reading_levels.to_dict(),
+            'sentence_lengths': self.sentence_lengths.to_dict(),
+            'phrases': self.phrases.to_dict(),
+            'top_complex': self.top_complex.to_dict(),
+            'top_adverbs': self.top_adverbs.to_dict(),
+            'top_openers': self.top_openers.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CorpusStat':
+        corpus_stat = cls(data['top_complex']['k'])
+        corpus_stat.counters.update(data['counters'])
+        corpus_stat.reading_levels = Histogram.from_dict(data['reading_levels'])
+        corpus_stat.sentence_lengths = QuantileSketch.from_dict(data['sentence_lengths'])
+        corpus_stat.phrases = CountMinSketch.from_dict(data['phrases'])
+        corpus_stat.top_complex = SpaceSaving.from_dict(data['top_complex'])
+        corpus_stat.top_adverbs = SpaceSaving.from_dict(data['top_adverbs'])
+        corpus_stat.top_openers = SpaceSaving.from_dict(data['top_openers'])
+        return corpus_stat
+
+    def save(self, path: str) -> None:
+        """
+        Write the statistics to a JSON file, replacing the old one only once it is fully written.
+        """
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CorpusStat':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+class DocumentStat:
+    """
+    Exact corpus-level statistics of a single document, small enough to keep one per indexed file.
+    Filled the same way as CorpusStat (process_text accepts either), and added to or subtracted from
+    a CorpusStat when the document is indexed, changed or removed.
+    """
+    def __init__(self):
+        self.counters = dict.fromkeys(CorpusStat.COUNTERS, 0)
+        # reading level -> number of sentences
+        self.reading_levels = {}
+        # sentence length, in words -> number of sentences
+        self.sentence_lengths = {}
+        # '<STAT key>:<phrase>' -> number of times it was found
+        self.phrases = {}
+
+    def add_document(self, number_of_paragraphs: int) -> None:
+        self.counters['total_documents'] += 1
+        self.counters['total_paragraphs'] += number_of_paragraphs
+
+    def add_sentence(
+        self,
+        number_of_letters: int,
+        number_of_words: int,
+        number_of_characters: int,
+        number_of_syllables: int,
+        number_of_polysyllables: int,
+        reading_level: int,
+        readability: Readability,
+        found: dict,
+    ) -> None:
+        """
+        Count a processed sentence, see CorpusStat.add_sentence().
+        """
+        self.counters['total_sentences'] += 1
+        self.counters['total_letters'] += number_of_letters
+        self.counters['total_words'] += number_of_words
+        self.counters['total_characters'] += number_of_characters
+        self.counters['total_syllables'] += number_of_syllables
+        self.counters['total_polysyllables'] += number_of_polysyllables
+        if readability is Readability.HARD:
+            self.counters['hard_sentences'] += 1
+        elif readability is Readability.VERY_HARD:
+            self.counters['very_hard_sentences'] += 1
+
+        self.reading_levels[reading_level] = self.reading_levels.get(reading_level, 0) + 1
+        self.sentence_lengths[number_of_words] = self.sentence_lengths.get(number_of_words, 0) + 1
+
+        for key, phrases in found.items():
+            self.counters[key] += len(phrases)
+            for phrase in phrases:
+                phrase = f'{key}:{phrase.lower()}'
+                self.phrases[phrase] = self.phrases.get(phrase, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            'counters': {key: value for key, value in self.counters.items() if value},
+            # JSON object keys are strings, so the integer-keyed ones are stored as pairs
+            'reading_levels': sorted(self.reading_levels.items()),
+            'sentence_lengths': sorted(self.sentence_lengths.items()),
+            'phrases': dict(self.phrases),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DocumentStat':
+        document_stat = cls()
+        document_stat.counters.update(data['counters'])
+        document_stat.reading_levels = {level: count for level, count in data['reading_levels']}
+        document_stat.sentence_lengths = {length: count for length, count in data['sentence_lengths']}
+        document_stat.phrases = dict(data['phrases'])
+        return document_stat
@@ -8,3 +8,9 @@ class FileNotReadable(Exception):
     def __init__(self, filepath):
         self.message = f'Cannot read file: {filepath}'
         super().__init__(self.message)
+
+
+class IncompatibleSketchError(Exception):
+    def __init__(self, sketch):
+        self.message = f'Cannot merge {sketch} objects created with different parameters.'
+        super().__init__(self.message)
@@ -16,27 +16,30 @@ def is_path(path: str) -> str:
     raise FileNotFoundError(f'File does not exist: {path}')
 
 
-def get_file_contents(filepath: str) -> list:
+def iter_file_contents(filepath: str):
     """
-    Parse the file by specified filepath and return text split into paragraphs.
+    Parse the file by specified filepath and yield its paragraphs one by one.
     """
     if not filepath:
         raise FilepathNotProvidedError
 
-    paragraphs = []
     # TODO(redd4ford): parsing from tables
     if filepath.endswith('.docx'):
         doc = Document(f'{filepath}')
         for paragraph in doc.paragraphs:
-            paragraphs.append(paragraph.text)
+            yield paragraph.text
     # TODO(redd4ford): support for more file extensions
     else:
         try:
             with open(f'{filepath}') as f:
-                paragraphs = []
                 for readline in f:
-                    line_strip = readline.strip()
-                    paragraphs.append(line_strip)
+                    yield readline.strip()
         except UnicodeDecodeError as err:
             raise FileNotReadable(filepath) from err
-    return paragraphs
+
+
+def get_file_contents(filepath: str) -> list:
+    """
+    Parse the file by specified filepath and return text split into paragraphs.
+    """
+    return list(iter_file_contents(filepath))
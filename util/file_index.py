@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+
+from util.corpus_stat import (
+    CorpusStat,
+    DocumentStat,
+)
+
+
+class FileIndex:
+    """
+    Persistent index of analyzed files:
+    path -> (mtime, size, content hash, language, last statistics, optional DocumentStat).
+    Lets repeated runs over a large tree skip the files that did not change.
+    Also keeps the CorpusStat of all files with a DocumentStat, updated only by the files that change.
+    """
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.entries = {}
+        self.corpus_stat = CorpusStat()
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                data = json.load(f)
+            if 'entries' in data:
+                self.entries = data['entries']
+                self.corpus_stat = CorpusStat.from_dict(data['corpus'])
+            else:
+                # an index written before the corpus statistics were kept in it: they are collected again
+                self.entries = data
+                for entry in self.entries.values():
+                    entry.pop('corpus', None)
+
+    def save(self) -> None:
+        """
+        Write the index to disk, replacing the old one only once it is fully written.
+        """
+        temp_path = f'{self.index_path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'entries': self.entries, 'corpus': self.corpus_stat.to_dict()}, f)
+        os.replace(temp_path, self.index_path)
+
+    @staticmethod
+    def _is_current(entry: dict, language: str, with_corpus: bool) -> bool:
+        # entries analyzed in another language, or without corpus statistics once they are needed, are outdated
+        return entry.get('language') == language and (not with_corpus or 'corpus' in entry)
+
+    def is_unchanged(
+        self,
+        path: str,
+        file_stat: os.stat_result,
+        language: str = None,
+        with_corpus: bool = False,
+    ) -> bool:
+        """
+        Check if the file's mtime and size match the indexed ones, without reading it.
+        """
+        entry = self.entries.get(path)
+        return (
+            entry is not None
+            and entry['mtime'] == file_stat.st_mtime_ns
+            and entry['size'] == file_stat.st_size
+            and self._is_current(entry, language, with_corpus)
+        )
+
+    def update(
+        self,
+        path: str,
+        analyze,
+        file_stat: os.stat_result = None,
+        language: str = None,
+        with_corpus: bool = False,
+    ):
+        """
+        Re-analyze the file if it changed since it was indexed, or was analyzed in another language.
+        `analyze` is called with the path and returns the file's statistics and DocumentStat (or None).
+        Returns the new statistics, or None if the file did not change.
+        """
+        file_stat = file_stat or os.stat(path)
+        if self.is_unchanged(path, file_stat, language, with_corpus):
+            return None
+
+        with open(path, 'rb') as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        entry = self.entries.get(path)
+        if entry is not None and entry['hash'] == content_hash and self._is_current(entry, language, with_corpus):
+            # touched, but the contents are the same
+            entry['mtime'], entry['size'] = file_stat.st_mtime_ns, file_stat.st_size
+            return None
+
+        stat, document_stat = analyze(path)
+        self.remove(path)
+        self.entries[path] = {
+            'mtime': file_stat.st_mtime_ns,
+            'size': file_stat.st_size,
+            'hash': content_hash,
+            'language': language,
+            'stat': stat,
+        }
+        if document_stat is not None:
+            self.entries[path]['corpus'] = document_stat.to_dict()
+            self.corpus_stat.add(document_stat)
+        return stat
+
+    def remove(self, path: str) -> bool:
+        """
+        Drop the file from the index. Returns False if it was not indexed.
+        """
+        entry = self.entries.pop(path, None)
+        if entry is not None and 'corpus' in entry:
+            self.corpus_stat.subtract(DocumentStat.from_dict(entry['corpus']))
+        return entry is not None
+
+    def paths_under(self, root: str) -> list:
+        """
+        Return all indexed paths inside the root directory.
+        """
+        prefix = os.path.join(root, '')
+        return [path for path in self.entries if path.startswith(prefix)]
+
+    def total_stat(self) -> dict:
+        """
+        Sum up the last statistics of all indexed files.
+        """
+        total = {}
+        for entry in self.entries.values():
+            for key, value in (entry['stat'] or {}).items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+    def total_corpus_stat(self) -> CorpusStat:
+        """
+        Return the CorpusStat of all indexed files that have one, with the top-K trackers rebuilt from their phrases.
+        Rebuilding reads every entry, so it is only done here and not whenever the index changes.
+        """
+        total = CorpusStat.from_dict(self.corpus_stat.to_dict())
+        return total.rebuild_trackers(
+            DocumentStat.from_dict(entry['corpus']) for entry in self.entries.values() if 'corpus' in entry
+        )
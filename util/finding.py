@@ -0,0 +1,21 @@
+from enum import Enum, auto
+
+
+class Finding(Enum):
+    """
+    Types of phrases highlighted in a sentence, named after the STAT keys that count them.
+    """
+    # adverbs (cyan)
+    ADVERBS = auto()
+    # qualifiers (cyan)
+    QUALIFIERS = auto()
+    # passive voice (green)
+    PASSIVE_VOICE = auto()
+    # phrases that have simpler alternatives (purple)
+    COMPLEX = auto()
+    # cliché sentence openers (green)
+    BAD_START = auto()
+
+    @property
+    def stat_key(self) -> str:
+        return self.name.lower()
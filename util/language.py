@@ -0,0 +1,133 @@
+import importlib
+import re
+from functools import lru_cache
+
+
+DEFAULT_LANGUAGE = 'en'
+AUTO_LANGUAGE = 'auto'
+
+# common function words of each language, to detect it without loading the profiles
+LANGUAGES = {
+    'en': {'the', 'and', 'is', 'are', 'of', 'to', 'in', 'that', 'it', 'was', 'with', 'for', 'this', 'not'},
+    'de': {'der', 'die', 'das', 'und', 'ist', 'nicht', 'ein', 'eine', 'zu', 'mit', 'auf', 'sich', 'den', 'wird'},
+    'fr': {'le', 'la', 'les', 'et', 'est', 'une', 'des', 'du', 'que', 'qui', 'pas', 'dans', 'pour', 'sont'},
+    'es': {'el', 'la', 'los', 'las', 'y', 'es', 'una', 'del', 'que', 'por', 'para', 'con', 'está', 'son'},
+    'ru': {'и', 'в', 'не', 'на', 'что', 'это', 'с', 'как', 'по', 'он', 'она', 'был', 'была', 'для'},
+}
+
+# only the first words of a paragraph are looked at
+DETECTION_WORDS = 40
+WORD_PATTERN = re.compile(r"[^\W\d_][\w\u0300-\u036f'’-]*")
+# sentence terminators of other scripts (CJK, Devanagari, Arabic), which may be mixed into the text of any language
+SCRIPT_TERMINATORS = '。！？।؟'
+
+
+class LanguageProfile:
+    """
+    Language-specific word lists and rules used to process the text.
+    """
+    def __init__(
+        self,
+        code: str,
+        name: str,
+        vowels: str,
+        complex_phrases: dict,
+        sentence_starters: tuple,
+        qualifying_words: dict,
+        qualifier_linkers: tuple,
+        passive_voice_pre_words: list,
+        participle_suffixes: tuple,
+        participle_pattern: str = None,
+        not_participles: dict = None,
+        adverb_suffixes: tuple = (),
+        not_adverbs: dict = None,
+        terminators: str = '.!?',
+        reading_ease: tuple = (206.835, 1.015, 84.6),
+    ):
+        self.code = code
+        self.name = name
+        # letters that form syllables
+        self.vowels = vowels
+        self.complex_phrases = complex_phrases
+        self.sentence_starters = sentence_starters
+        self.qualifying_words = qualifying_words
+        self.qualifier_linkers = qualifier_linkers
+        # passive voice: one of the pre-words followed by a participle, a word with one of the suffixes
+        # that also matches the pattern as written (if the suffix alone is not a reliable cue), except for the listed ones
+        self.passive_voice_pre_words = passive_voice_pre_words
+        self.participle_suffixes = participle_suffixes
+        self.participle_pattern = re.compile(participle_pattern) if participle_pattern else None
+        self.not_participles = not_participles or {}
+        # adverbs: words with one of the suffixes, except for the listed ones
+        self.adverb_suffixes = adverb_suffixes
+        self.not_adverbs = not_adverbs or {}
+        # characters that end a sentence
+        self.terminators = terminators
+        # constant, words per sentence and syllables per word coefficients of the language's adaptation
+        # of the Flesch Reading Ease formula: ease = constant - a * words per sentence - b * syllables per word.
+        # The other reading level formulas (and sentence highlighting) use the English constants for every language.
+        self.reading_ease = reading_ease
+
+
+@lru_cache(maxsize=None)
+def get_profile(language: str) -> LanguageProfile:
+    """
+    Load the language's profile on first use.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f'Unsupported language: {language}')
+    return importlib.import_module(f'util.languages.{language}').PROFILE
+
+
+def detect_language(paragraph: str) -> str:
+    """
+    Guess the paragraph's language by its most common words. Falls back to the default language.
+    """
+    words = [word.lower() for word in WORD_PATTERN.findall(paragraph)[:DETECTION_WORDS]]
+    scores = {language: sum(word in markers for word in words) for language, markers in LANGUAGES.items()}
+    language = max(scores, key=scores.get)
+    return language if scores[language] > scores[DEFAULT_LANGUAGE] else DEFAULT_LANGUAGE
+
+
+def resolve_language(language: str, paragraph: str) -> str:
+    """
+    Return the language to process the paragraph with, detecting it if the language is 'auto'.
+    """
+    return detect_language(paragraph) if language == AUTO_LANGUAGE else language
+
+
+def is_sentence_start(char: str) -> bool:
+    """
+    Check if a sentence can start with the character: an uppercase letter,
+    or any letter of a script without case (CJK, Arabic, Hebrew, Devanagari, ...).
+    """
+    return char.isupper() or (char.isalpha() and not char.islower())
+
+
+@lru_cache(maxsize=1)
+def get_sentence_start_letters() -> str:
+    """
+    Return a regex character class body with all the characters a sentence can start with, as ranges.
+    """
+    # no letters exist above this point
+    codes = [code for code in range(0x40000) if is_sentence_start(chr(code))]
+    ranges = []
+    start = previous = codes[0]
+    for code in codes[1:]:
+        if code != previous + 1:
+            ranges.append((start, previous))
+            start = code
+        previous = code
+    ranges.append((start, previous))
+    return ''.join(chr(first) if first == last else f'{chr(first)}-{chr(last)}' for first, last in ranges)
+
+
+@lru_cache(maxsize=None)
+def get_sentence_pattern(language: str) -> re.Pattern:
+    """
+    Return the pattern that finds sentences: from an uppercase letter, or a letter of a script without case,
+    up to a terminator. Sentences of cased scripts that start with a lowercase letter are not found.
+    """
+    terminators = re.escape(get_profile(language).terminators + SCRIPT_TERMINATORS)
+    # a backslash ends a sentence too, as it always did
+    return re.compile(rf'([{get_sentence_start_letters()}][^\\\\{terminators}]*[\\\\{terminators}])', re.M)
@@ -0,0 +1,56 @@
+from util.language import LanguageProfile
+
+
+PROFILE = LanguageProfile(
+    code='de',
+    name='German',
+    vowels='aeiouyäöü',
+    # matched case-sensitively, so nouns keep their capitals
+    complex_phrases={
+        'aufgrund der Tatsache, dass': ['weil'],
+        'beinhalten': ['enthalten'],
+        'diesbezüglich': ['dazu'],
+        'durchführen': ['machen'],
+        'in Anbetracht': ['wegen'],
+        'im Rahmen von': ['bei', 'in'],
+        'im Vorfeld': ['vorher'],
+        'mithilfe von': ['mit'],
+        'seitens': ['von'],
+        'zum gegenwärtigen Zeitpunkt': ['jetzt'],
+        'zwecks': ['für', 'um'],
+    },
+    sentence_starters=(
+        'Es ist', 'Es war', 'Es gibt', 'Bekanntlich', 'Natürlich', 'Offensichtlich', 'Selbstverständlich',
+        'Ohne Zweifel', 'Tatsache ist', 'Ja, ', 'Nein, ',
+    ),
+    qualifying_words={
+        'glaube': ['ich', 'wir'],
+        'denke': ['ich'],
+        'denken': ['wir'],
+        'finde': ['ich'],
+        'meiner': [],
+        'vielleicht': [],
+        'eigentlich': [],
+        'möglicherweise': [],
+        'eventuell': [],
+        'irgendwie': [],
+    },
+    qualifier_linkers=('würde', 'würden'),
+    passive_voice_pre_words=['wird', 'werden', 'wurde', 'wurden'],
+    participle_suffixes=('t', 'en'),
+    # ge...t / ge...en, also after a separable prefix (eingeladen), or ...t after an inseparable one (verkauft).
+    # Lowercase only, so that nouns (Geschichten) and infinitives of the future tense (werden kommen) do not match
+    participle_pattern=(
+        r'(?:ab|an|auf|aus|bei|durch|ein|fest|her|hin|los|mit|nach|vor|weg|zu|zurück|zusammen)?ge[a-zäöüß]{2,}(?:t|en)'
+        r'|(?:be|emp|ent|er|miss|ver|zer)[a-zäöüß]{2,}t'
+    ),
+    # infinitives that look like participles
+    not_participles={
+        'gebrauchen': 1, 'gedenken': 1, 'gefallen': 1, 'gehorchen': 1, 'gehören': 1, 'gelangen': 1, 'gelingen': 1,
+        'genießen': 1, 'genügen': 1, 'geschehen': 1, 'gestalten': 1, 'gestehen': 1, 'gewinnen': 1, 'gewöhnen': 1,
+        'bereit': 1,
+    },
+    # Amstad's adaptation of the Flesch Reading Ease
+    reading_ease=(180, 1.0, 58.5),
+    # German adverbs have no distinctive suffix
+)
@@ -0,0 +1,24 @@
+from util.language import LanguageProfile
+from util.word_lists import (
+    complex_phrases,
+    ly_words_not_adverbs,
+    passive_voice_pre_words,
+    qualifier_linkers,
+    qualifying_words,
+    sentence_starters,
+)
+
+
+PROFILE = LanguageProfile(
+    code='en',
+    name='English',
+    vowels='aeiouy',
+    complex_phrases=complex_phrases,
+    sentence_starters=sentence_starters,
+    qualifying_words=qualifying_words,
+    qualifier_linkers=qualifier_linkers,
+    passive_voice_pre_words=passive_voice_pre_words,
+    participle_suffixes=('ed',),
+    adverb_suffixes=('ly',),
+    not_adverbs=ly_words_not_adverbs,
+)
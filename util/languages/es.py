@@ -0,0 +1,50 @@
+from util.language import LanguageProfile
+
+
+PROFILE = LanguageProfile(
+    code='es',
+    name='Spanish',
+    vowels='aeiouyáéíóúü',
+    complex_phrases={
+        'a fin de': ['para'],
+        'a nivel de': ['en'],
+        'con el objetivo de': ['para'],
+        'debido al hecho de que': ['porque'],
+        'en el día de hoy': ['hoy'],
+        'en el momento actual': ['ahora'],
+        'en relación con': ['sobre'],
+        'llevar a cabo': ['hacer'],
+        'por medio de': ['con', 'por'],
+        'proceder a': ['hacer'],
+    },
+    sentence_starters=(
+        'Está claro que', 'Es evidente que', 'Es obvio que', 'Obviamente', 'Por supuesto', 'Sin duda', 'De hecho',
+        'Sí, ', 'No, ',
+    ),
+    qualifying_words={
+        'creo': [],
+        'creemos': [],
+        'pienso': [],
+        'pensamos': [],
+        'opinión': ['mi', 'nuestra'],
+        'quizás': [],
+        'quizá': [],
+        'posiblemente': [],
+        'probablemente': [],
+    },
+    qualifier_linkers=('no',),
+    passive_voice_pre_words=['es', 'son', 'fue', 'fueron', 'era', 'eran', 'sido', 'ser', 'será', 'serán'],
+    participle_suffixes=('ado', 'ada', 'ados', 'adas', 'ido', 'ida', 'idos', 'idas'),
+    # common words that are not participles but end like them (es nada, es cada vez)
+    not_participles={
+        'nada': 1, 'cada': 1, 'demasiado': 1, 'demasiada': 1, 'demasiados': 1, 'demasiadas': 1, 'vida': 1,
+        'comida': 1, 'bebida': 1, 'salida': 1, 'entrada': 1, 'llegada': 1, 'partida': 1, 'medida': 1, 'mirada': 1,
+        'jornada': 1, 'temporada': 1, 'década': 1, 'parada': 1, 'ensalada': 1, 'lado': 1, 'ruido': 1, 'sonido': 1,
+        'olvido': 1, 'partido': 1,
+    },
+    adverb_suffixes=('mente',),
+    not_adverbs={'mente': 1, 'demente': 1, 'clemente': 1, 'simiente': 1, 'posiblemente': 1, 'probablemente': 1},
+    terminators='.!?…',
+    # Fernández-Huerta's adaptation of the Flesch Reading Ease
+    reading_ease=(206.84, 1.02, 60.0),
+)
@@ -0,0 +1,59 @@
+from util.language import LanguageProfile
+
+
+PROFILE = LanguageProfile(
+    code='fr',
+    name='French',
+    vowels='aeiouyàâéèêëîïôûùüÿœæ',
+    complex_phrases={
+        'à l’heure actuelle': ['maintenant'],
+        "à l'heure actuelle": ['maintenant'],
+        'afin de': ['pour'],
+        'au niveau de': ['pour', 'dans'],
+        'dans le but de': ['pour'],
+        'du fait que': ['parce que'],
+        'en ce qui concerne': ['pour', 'sur'],
+        'en vue de': ['pour'],
+        'effectuer': ['faire'],
+        'par le biais de': ['par'],
+        'procéder à': ['faire'],
+    },
+    sentence_starters=(
+        'Il est', 'Il était', 'Il y a', 'C’est', "C'est", 'Bien sûr', 'Évidemment', 'Sans aucun doute',
+        'En fait', 'Oui, ', 'Non, ',
+    ),
+    qualifying_words={
+        'crois': ['je'],
+        'croyons': ['nous'],
+        'pense': ['je'],
+        'pensons': ['nous'],
+        'semble': ['il'],
+        'peut-être': [],
+        'probablement': [],
+        'éventuellement': [],
+        'plutôt': [],
+    },
+    qualifier_linkers=('ne',),
+    passive_voice_pre_words=['est', 'sont', 'était', 'étaient', 'été', 'être', 'sera', 'seront', 'fut', 'furent'],
+    # only the -é participles: -is, -it and -u also end adjectives and adverbs (est plus grand, est petit)
+    participle_suffixes=('é', 'ée', 'és', 'ées'),
+    # verbs that form the past tense with être, in the active voice (il est arrivé)
+    not_participles={
+        f'{stem}{ending}': 1
+        for stem in (
+            'allé', 'arrivé', 'entré', 'rentré', 'monté', 'remonté', 'resté', 'retourné', 'tombé', 'retombé',
+            'né', 'décédé', 'passé', 'repassé',
+        )
+        for ending in ('', 'e', 's', 'es')
+    },
+    adverb_suffixes=('ment',),
+    not_adverbs={
+        'moment': 1, 'comment': 1, 'gouvernement': 1, 'document': 1, 'développement': 1, 'élément': 1,
+        'jugement': 1, 'logement': 1, 'paiement': 1, 'mouvement': 1, 'traitement': 1, 'changement': 1,
+        'sentiment': 1, 'ment': 1, 'dément': 1,
+        # counted as qualifiers instead
+        'probablement': 1, 'éventuellement': 1,
+    },
+    # Kandel and Moles' adaptation of the Flesch Reading Ease
+    reading_ease=(207, 1.015, 73.6),
+)
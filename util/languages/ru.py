@@ -0,0 +1,38 @@
+from util.language import LanguageProfile
+
+
+PROFILE = LanguageProfile(
+    code='ru',
+    name='Russian',
+    vowels='аеёиоуыэюя',
+    complex_phrases={
+        'в настоящее время': ['сейчас'],
+        'в связи с тем, что': ['потому что'],
+        'в целях': ['для'],
+        'вследствие того, что': ['потому что'],
+        'на сегодняшний день': ['сегодня', 'сейчас'],
+        'осуществлять': ['делать'],
+        'посредством': ['с помощью', 'через'],
+        'производить': ['делать'],
+        'с целью': ['чтобы'],
+    },
+    sentence_starters=(
+        'Очевидно', 'Конечно', 'Безусловно', 'Разумеется', 'Как известно', 'Дело в том, что', 'Да, ', 'Нет, ',
+    ),
+    qualifying_words={
+        'думаю': ['я'],
+        'думаем': ['мы'],
+        'считаю': ['я'],
+        'считаем': ['мы'],
+        'кажется': ['мне', 'нам'],
+        'наверное': [],
+        'возможно': [],
+        'вероятно': [],
+        'пожалуй': [],
+    },
+    qualifier_linkers=('не',),
+    passive_voice_pre_words=['был', 'была', 'было', 'были', 'будет', 'будут', 'быть'],
+    participle_suffixes=('ан', 'ана', 'ано', 'аны', 'ен', 'ена', 'ено', 'ены', 'ян', 'яна', 'ято', 'ят', 'ыт', 'ит'),
+    # Oborneva's adaptation of the Flesch Reading Ease
+    reading_ease=(206.835, 1.3, 60.1),
+)
@@ -0,0 +1,127 @@
+import math
+import re
+from functools import lru_cache
+
+from util.language import (
+    DEFAULT_LANGUAGE,
+    LANGUAGES,
+    get_profile,
+)
+
+
+LETTERS_PATTERN = re.compile(r'[^\W\d_]')
+
+
+@lru_cache(maxsize=None)
+def get_vowel_groups_pattern(language: str) -> re.Pattern:
+    return re.compile(f'[{re.escape(get_profile(language).vowels)}]+')
+
+
+@lru_cache(maxsize=65536)
+def get_word_counts(word: str, language: str = DEFAULT_LANGUAGE) -> tuple:
+    """
+    Return (letters, syllables) of the word. Cached, as the vocabulary of a text repeats heavily.
+    """
+    letters = LETTERS_PATTERN.findall(word)
+    if not letters:
+        return 0, 0
+    word = ''.join(letters).lower()
+    syllables = len(get_vowel_groups_pattern(language).findall(word))
+    if language != 'en':
+        return len(letters), max(syllables, 1)
+    # silent endings: "make", "finished", "makes"
+    if word.endswith('e') and not word.endswith(('le', 'ee')):
+        syllables -= 1
+    elif word.endswith('ed') and not word.endswith(('ted', 'ded')):
+        syllables -= 1
+    elif word.endswith('es') and not word.endswith(('ses', 'zes', 'ces', 'ges', 'xes', 'shes', 'ches')):
+        syllables -= 1
+    return len(letters), max(syllables, 1)
+
+
+def get_sentence_counts(words_in_sentence: list, language: str = DEFAULT_LANGUAGE) -> tuple:
+    """
+    Return (letters, syllables, polysyllables) of the sentence in a single pass over its words.
+    Polysyllables are words with three or more syllables.
+    """
+    letters = syllables = polysyllables = 0
+    for word in words_in_sentence:
+        word_letters, word_syllables = get_word_counts(word, language)
+        letters += word_letters
+        syllables += word_syllables
+        if word_syllables >= 3:
+            polysyllables += 1
+    return letters, syllables, polysyllables
+
+
+def automated_readability_index(
+    letters: int, words: int, sentences: int, syllables: int, polysyllables: int, language: str = DEFAULT_LANGUAGE
+) -> float:
+    return 4.71 * (letters / words) + 0.5 * (words / sentences) - 21.43
+
+
+def flesch_kincaid(
+    letters: int, words: int, sentences: int, syllables: int, polysyllables: int, language: str = DEFAULT_LANGUAGE
+) -> float:
+    return 0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
+
+
+def flesch_reading_ease(
+    letters: int, words: int, sentences: int, syllables: int, polysyllables: int, language: str = DEFAULT_LANGUAGE
+) -> float:
+    constant, sentence_coefficient, word_coefficient = get_profile(language).reading_ease
+    return constant - sentence_coefficient * (words / sentences) - word_coefficient * (syllables / words)
+
+
+def gunning_fog(
+    letters: int, words: int, sentences: int, syllables: int, polysyllables: int, language: str = DEFAULT_LANGUAGE
+) -> float:
+    return 0.4 * ((words / sentences) + 100 * (polysyllables / words))
+
+
+def smog(
+    letters: int, words: int, sentences: int, syllables: int, polysyllables: int, language: str = DEFAULT_LANGUAGE
+) -> float:
+    return 1.043 * math.sqrt(polysyllables * (30 / sentences)) + 3.1291
+
+
+def coleman_liau(
+    letters: int, words: int, sentences: int, syllables: int, polysyllables: int, language: str = DEFAULT_LANGUAGE
+) -> float:
+    return 0.0588 * (letters / words * 100) - 0.296 * (sentences / words * 100) - 15.8
+
+
+# Only the Flesch Reading Ease has per-language constants (see LanguageProfile.reading_ease).
+# The grade level formulas are calibrated on English and give rough values for other languages.
+READING_METRICS = {
+    'ari': ('Automated Readability Index', automated_readability_index),
+    'flesch-kincaid': ('Flesch-Kincaid grade', flesch_kincaid),
+    'flesch': ('Flesch Reading Ease', flesch_reading_ease),
+    'gunning-fog': ('Gunning Fog index', gunning_fog),
+    'smog': ('SMOG grade', smog),
+    'coleman-liau': ('Coleman-Liau index', coleman_liau),
+}
+
+
+def get_reading_levels(
+    stat: dict,
+    metrics: tuple = tuple(READING_METRICS),
+    language: str = DEFAULT_LANGUAGE,
+) -> dict:
+    """
+    Calculate the selected reading level metrics from text statistics totals.
+    All of them use the counts gathered in the same pass, so adding a metric costs no extra pass over the text.
+    With language 'auto', the default language's constants are used.
+    """
+    if not stat['total_words'] or not stat['total_sentences']:
+        return dict.fromkeys(metrics, 0.0)
+    if language not in LANGUAGES:
+        language = DEFAULT_LANGUAGE
+    counts = (
+        stat['total_letters'],
+        stat['total_words'],
+        stat['total_sentences'],
+        stat['total_syllables'],
+        stat['total_polysyllables'],
+    )
+    return {metric: READING_METRICS[metric][1](*counts, language=language) for metric in metrics}
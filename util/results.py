@@ -0,0 +1,190 @@
+from array import array
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+
+from util.finding import Finding
+from util.readability import Readability
+
+
+class FindingSpan:
+    """
+    A single highlighted phrase. Offsets are relative to the paragraph.
+    """
+    __slots__ = ('finding', 'start', 'end')
+
+    def __init__(self, finding: Finding, start: int, end: int):
+        self.finding = finding
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f'FindingSpan({self.finding.name}, {self.start}, {self.end})'
+
+
+class SentenceResult:
+    """
+    A view of one sentence's results. Offsets are relative to the paragraph.
+    """
+    __slots__ = ('paragraph', 'start', 'end', 'words', 'reading_level', 'readability', 'findings')
+
+    def __init__(
+        self,
+        paragraph: int,
+        start: int,
+        end: int,
+        words: int,
+        reading_level: int,
+        readability: Readability,
+        findings: list,
+    ):
+        self.paragraph = paragraph
+        self.start = start
+        self.end = end
+        self.words = words
+        self.reading_level = reading_level
+        self.readability = readability
+        self.findings = findings
+
+    def __repr__(self):
+        return (
+            f'SentenceResult(paragraph={self.paragraph}, start={self.start}, end={self.end}, '
+            f'readability={self.readability.name}, findings={self.findings})'
+        )
+
+
+class SentenceResults:
+    """
+    Columnar, array-backed per-sentence results of a processed text.
+    A sentence costs about 23 bytes and a finding 9 bytes, and the arrays pickle as raw bytes,
+    so full results for a large corpus can be kept in memory and passed between worker processes.
+    """
+    def __init__(self):
+        self.paragraphs = 0
+        # sentence columns
+        self.sentence_paragraph = array('I')
+        self.sentence_start = array('I')
+        self.sentence_end = array('I')
+        self.sentence_words = array('I')
+        self.sentence_reading_level = array('h')
+        self.sentence_readability = array('B')
+        self.sentence_first_finding = array('I')
+        # finding columns, in sentence order
+        self.finding_type = array('B')
+        self.finding_start = array('I')
+        self.finding_end = array('I')
+        # the paragraph being processed
+        self._paragraph = ''
+        self._position = 0
+
+    def __len__(self):
+        return len(self.sentence_start)
+
+    def begin_paragraph(self, paragraph: str) -> None:
+        """
+        Start collecting results for the next paragraph of the text.
+        """
+        self.paragraphs += 1
+        self._paragraph = paragraph
+        self._position = 0
+
+    def add_sentence(
+        self,
+        sentence: str,
+        number_of_words: int,
+        reading_level: int,
+        readability: Readability,
+        found: dict,
+    ) -> None:
+        """
+        Store a processed sentence of the current paragraph. `found` maps STAT keys to the lists of found phrases.
+        """
+        start = self._paragraph.find(sentence, self._position)
+        if start < 0:
+            start = self._position
+        self._position = start + len(sentence)
+
+        self.sentence_paragraph.append(self.paragraphs - 1)
+        self.sentence_start.append(start)
+        self.sentence_end.append(start + len(sentence))
+        self.sentence_words.append(number_of_words)
+        self.sentence_reading_level.append(max(min(reading_level, 32767), -32768))
+        self.sentence_readability.append(readability.value)
+        self.sentence_first_finding.append(len(self.finding_type))
+
+        for finding in Finding:
+            # repeated phrases are matched to their consecutive occurrences
+            positions = {}
+            for phrase in found.get(finding.stat_key, []):
+                phrase_start = sentence.find(phrase, positions.get(phrase, 0))
+                if phrase_start < 0:
+                    phrase_start = sentence.find(phrase)
+                    if phrase_start < 0:
+                        continue
+                positions[phrase] = phrase_start + len(phrase)
+                self.finding_type.append(finding.value)
+                self.finding_start.append(start + phrase_start)
+                self.finding_end.append(start + phrase_start + len(phrase))
+
+    def skip_paragraph(self) -> None:
+        """
+        Account for an empty paragraph, so that paragraph numbers match the text.
+        """
+        self.begin_paragraph('')
+
+    def _finding_range(self, index: int) -> range:
+        first = self.sentence_first_finding[index]
+        last = self.sentence_first_finding[index + 1] if index + 1 < len(self) else len(self.finding_type)
+        return range(first, last)
+
+    def __getitem__(self, index: int) -> SentenceResult:
+        if index < 0:
+            index += len(self)
+        return SentenceResult(
+            self.sentence_paragraph[index],
+            self.sentence_start[index],
+            self.sentence_end[index],
+            self.sentence_words[index],
+            self.sentence_reading_level[index],
+            Readability(self.sentence_readability[index]),
+            [
+                FindingSpan(Finding(self.finding_type[i]), self.finding_start[i], self.finding_end[i])
+                for i in self._finding_range(index)
+            ],
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def in_paragraph(self, paragraph: int) -> list:
+        """
+        Return the results of all sentences in the paragraph.
+        """
+        first = bisect_left(self.sentence_paragraph, paragraph)
+        last = bisect_right(self.sentence_paragraph, paragraph)
+        return [self[i] for i in range(first, last)]
+
+    def extend(self, other: 'SentenceResults') -> 'SentenceResults':
+        """
+        Append the results of the text that follows this one, e.g. a chunk processed by another worker.
+        """
+        paragraph_shift, finding_shift = self.paragraphs, len(self.finding_type)
+        self.sentence_paragraph.extend(paragraph + paragraph_shift for paragraph in other.sentence_paragraph)
+        self.sentence_start.extend(other.sentence_start)
+        self.sentence_end.extend(other.sentence_end)
+        self.sentence_words.extend(other.sentence_words)
+        self.sentence_reading_level.extend(other.sentence_reading_level)
+        self.sentence_readability.extend(other.sentence_readability)
+        self.sentence_first_finding.extend(first + finding_shift for first in other.sentence_first_finding)
+        self.finding_type.extend(other.finding_type)
+        self.finding_start.extend(other.finding_start)
+        self.finding_end.extend(other.finding_end)
+        self.paragraphs += other.paragraphs
+        return self
+
+    def __getstate__(self):
+        # the current paragraph text is only needed while processing
+        state = self.__dict__.copy()
+        state['_paragraph'], state['_position'] = '', 0
+        return state
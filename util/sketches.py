@@ -0,0 +1,261 @@
+import math
+from array import array
+from hashlib import blake2b
+
+from util.exceptions import IncompatibleSketchError
+
+
+class Histogram:
+    """
+    Fixed-range integer histogram. Values outside the range are clamped into the edge bins.
+    """
+    def __init__(self, low: int = -10, high: int = 30):
+        self.low = low
+        self.high = high
+        self.bins = array('Q', [0] * (high - low + 1))
+
+    def add(self, value: int, count: int = 1) -> None:
+        """
+        Count the value in its bin, or take a counted one away again with a negative count.
+        """
+        index = min(max(value, self.low), self.high) - self.low
+        self.bins[index] += count
+
+    def merge(self, other: 'Histogram') -> 'Histogram':
+        """
+        Add the other histogram's bins to this one.
+        """
+        if (self.low, self.high) != (other.low, other.high):
+            raise IncompatibleSketchError(type(self).__name__)
+        for i, count in enumerate(other.bins):
+            self.bins[i] += count
+        return self
+
+    def items(self) -> list:
+        """
+        Return a list of (value, count) pairs for non-empty bins.
+        """
+        return [(self.low + i, count) for i, count in enumerate(self.bins) if count]
+
+    @property
+    def total(self) -> int:
+        return sum(self.bins)
+
+    def to_dict(self) -> dict:
+        return {'low': self.low, 'high': self.high, 'bins': self.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Histogram':
+        histogram = cls(data['low'], data['high'])
+        for value, count in data['bins']:
+            histogram.add(value, count)
+        return histogram
+
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch for non-negative values (DDSketch).
+    Every quantile is answered within the relative accuracy, and the number of buckets never exceeds max_buckets.
+    """
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _collapse(self) -> None:
+        # fold the lowest buckets together to keep the memory bounded
+        keys = sorted(self.buckets)
+        overflow = len(keys) - self.max_buckets
+        if overflow > 0:
+            target = keys[overflow]
+            for key in keys[:overflow]:
+                self.buckets[target] += self.buckets.pop(key)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """
+        Count the value, or take a counted one away again with a negative count.
+        """
+        self.count += count
+        if value <= 0:
+            self.zero_count += count
+            return
+        key = self._key(value)
+        if count < 0 and key not in self.buckets:
+            # it was folded into the lowest bucket by _collapse()
+            key = min(self.buckets)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+        if not self.buckets[key]:
+            del self.buckets[key]
+        elif len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Add the other sketch's buckets to this one.
+        """
+        if (self.relative_accuracy, self.max_buckets) != (other.relative_accuracy, other.max_buckets):
+            raise IncompatibleSketchError(type(self).__name__)
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self._collapse()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Return the approximate value at quantile q (0 <= q <= 1), or 0 if the sketch is empty.
+        """
+        if not self.count:
+            return 0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'buckets': sorted(self.buckets.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'], data['max_buckets'])
+        sketch.buckets = {key: count for key, count in data['buckets']}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        return sketch
+
+
+def _hash_pair(item: str) -> tuple:
+    # stable across processes, unlike hash() on str
+    digest = blake2b(item.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class CountMinSketch:
+    """
+    Approximate frequency counter with a fixed width x depth table. Estimates never undercount.
+    """
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = [array('Q', [0] * width) for _ in range(depth)]
+
+    def _indexes(self, item: str):
+        h1, h2 = _hash_pair(item)
+        return ((h1 + row * h2) % self.width for row in range(self.depth))
+
+    def add(self, item: str, count: int = 1) -> None:
+        """
+        Count the item, or take a counted one away again with a negative count.
+        """
+        for row, index in zip(self.table, self._indexes(item)):
+            row[index] += count
+
+    def estimate(self, item: str) -> int:
+        """
+        Return the estimated number of times the item was counted.
+        """
+        return min(row[index] for row, index in zip(self.table, self._indexes(item)))
+
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        """
+        Add the other sketch's table to this one.
+        """
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise IncompatibleSketchError(type(self).__name__)
+        for row, other_row in zip(self.table, other.table):
+            for i, count in enumerate(other_row):
+                if count:
+                    row[i] += count
+        return self
+
+    def to_dict(self) -> dict:
+        # only the non-zero cells, as most of the table stays empty for a single document
+        cells = [[r, i, count] for r, row in enumerate(self.table) for i, count in enumerate(row) if count]
+        return {'width': self.width, 'depth': self.depth, 'cells': cells}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CountMinSketch':
+        sketch = cls(data['width'], data['depth'])
+        for row, index, count in data['cells']:
+            sketch.table[row][index] = count
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Top-K heavy hitters tracker (Space-Saving) that keeps at most k counters.
+    Each counter stores (count, error), where count - error is a guaranteed lower bound.
+    """
+    def __init__(self, k: int = 50):
+        self.k = k
+        self.counters = {}
+
+    def add(self, item: str, count: int = 1) -> None:
+        """
+        Count the item, evicting the smallest counter if there is no room left.
+        """
+        if item in self.counters:
+            current, error = self.counters[item]
+            self.counters[item] = (current + count, error)
+        elif len(self.counters) < self.k:
+            self.counters[item] = (count, 0)
+        else:
+            evicted = min(self.counters, key=lambda key: self.counters[key][0])
+            minimum, _ = self.counters.pop(evicted)
+            self.counters[item] = (minimum + count, minimum)
+
+    def _floor(self) -> int:
+        # the most an untracked item could have been counted
+        if len(self.counters) < self.k:
+            return 0
+        return min(count for count, _ in self.counters.values())
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """
+        Combine the other tracker's counters with this one and keep the k largest.
+        """
+        if self.k != other.k:
+            raise IncompatibleSketchError(type(self).__name__)
+        own_floor, other_floor = self._floor(), other._floor()
+        merged = {}
+        for item in self.counters.keys() | other.counters.keys():
+            count, error = self.counters.get(item, (own_floor, own_floor))
+            other_count, other_error = other.counters.get(item, (other_floor, other_floor))
+            merged[item] = (count + other_count, error + other_error)
+        self.counters = dict(sorted(merged.items(), key=lambda pair: (-pair[1][0], pair[0]))[:self.k])
+        return self
+
+    def top(self, n: int = 10) -> list:
+        """
+        Return up to n (item, count) pairs, most frequent first.
+        """
+        ranked = sorted(self.counters.items(), key=lambda pair: (-pair[1][0], pair[0]))
+        return [(item, count) for item, (count, _) in ranked[:n]]
+
+    def to_dict(self) -> dict:
+        return {'k': self.k, 'counters': [[item, count, error] for item, (count, error) in self.counters.items()]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SpaceSaving':
+        tracker = cls(data['k'])
+        tracker.counters = {item: (count, error) for item, count, error in data['counters']}
+        return tracker
@@ -0,0 +1,299 @@
+import curses
+from collections import OrderedDict
+
+from exporter import (
+    FINDING_FORMATS,
+    READABILITY_FORMATS,
+    get_finding_hint,
+    iter_segments,
+)
+from text_processor import process_paragraph
+from util.language import DEFAULT_LANGUAGE
+from util.line_format import LineFormat
+from util.results import SentenceResults
+
+
+CURSES_COLORS = {
+    LineFormat.BLUE: curses.COLOR_BLUE,
+    LineFormat.CYAN: curses.COLOR_CYAN,
+    LineFormat.GREEN: curses.COLOR_GREEN,
+    LineFormat.PURPLE: curses.COLOR_MAGENTA,
+    LineFormat.YELLOW: curses.COLOR_YELLOW,
+    LineFormat.RED: curses.COLOR_RED,
+}
+
+# paragraphs analyzed ahead of the viewport while waiting for a key
+PREFETCH = 30
+
+
+class Document:
+    """
+    A text whose paragraphs are analyzed only when they are needed.
+    Analyzed paragraphs are kept in an LRU cache of cache_size paragraphs.
+    """
+    def __init__(self, paragraphs: list, cache_size: int = 2000, language: str = DEFAULT_LANGUAGE):
+        self.paragraphs = paragraphs
+        self.cache_size = cache_size
+        self.language = language
+        self.cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.paragraphs)
+
+    def is_analyzed(self, index: int) -> bool:
+        return index in self.cache
+
+    def analyze(self, index: int) -> tuple:
+        """
+        Return (sentence results, segments) of the paragraph, where segments are (start, end, readability, findings).
+        """
+        if index in self.cache:
+            self.cache.move_to_end(index)
+            return self.cache[index]
+
+        paragraph = self.paragraphs[index]
+        sentence_results = []
+        if paragraph != '':
+            results = SentenceResults()
+            process_paragraph(paragraph, results=results, language=self.language)
+            sentence_results = list(results)
+        segments = []
+        start = 0
+        for text, readability, findings in iter_segments(paragraph, sentence_results):
+            segments.append((start, start + len(text), readability, findings))
+            start += len(text)
+
+        self.cache[index] = sentence_results, segments
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return self.cache[index]
+
+    def wrap(self, index: int, width: int) -> list:
+        """
+        Split the paragraph into lines no longer than width. Returns (start, end) offsets of the lines.
+        """
+        paragraph = self.paragraphs[index]
+        lines = []
+        start = 0
+        while len(paragraph) - start > width:
+            cut = paragraph.rfind(' ', start, start + width + 1)
+            if cut <= start:
+                lines.append((start, start + width))
+                start += width
+            else:
+                lines.append((start, cut))
+                start = cut + 1
+        lines.append((start, len(paragraph)))
+        return lines
+
+    def findings(self, index: int) -> list:
+        """
+        Return all FindingSpans of the paragraph, ordered by position.
+        """
+        sentence_results, _ = self.analyze(index)
+        return sorted(
+            (finding for result in sentence_results for finding in result.findings),
+            key=lambda finding: (finding.start, finding.end),
+        )
+
+    def next_finding(self, index: int, offset: int):
+        """
+        Return (paragraph index, FindingSpan) of the first finding after the offset, or None.
+        """
+        for i in range(index, len(self)):
+            for finding in self.findings(i):
+                if i > index or finding.start > offset:
+                    return i, finding
+        return None
+
+    def previous_finding(self, index: int, offset: int):
+        """
+        Return (paragraph index, FindingSpan) of the last finding before the offset, or None.
+        """
+        for i in range(min(index, len(self) - 1), -1, -1):
+            for finding in reversed(self.findings(i)):
+                if i < index or finding.start < offset:
+                    return i, finding
+        return None
+
+
+class Viewer:
+    """
+    Pager that renders only the paragraphs in the viewport, and analyzes the following ones while idle.
+    """
+    def __init__(self, screen, document: Document, title: str = ''):
+        self.screen = screen
+        self.document = document
+        self.title = title
+        # (paragraph index, line index) shown at the top
+        self.top = (0, 0)
+        # (paragraph index, FindingSpan) selected with n/N
+        self.selected = None
+        self.attributes = {}
+
+        curses.curs_set(0)
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            for pair, (line_format, color) in enumerate(CURSES_COLORS.items(), start=1):
+                curses.init_pair(pair, color, -1)
+                self.attributes[line_format] = curses.color_pair(pair)
+
+    @property
+    def width(self) -> int:
+        return max(self.screen.getmaxyx()[1] - 1, 1)
+
+    @property
+    def height(self) -> int:
+        # the last row is the status bar
+        return max(self.screen.getmaxyx()[0] - 1, 1)
+
+    def scroll(self, lines: int) -> None:
+        """
+        Move the viewport by the number of lines, up if negative.
+        """
+        if not len(self.document):
+            return
+        index, line = self.top
+        while lines > 0:
+            if line + 1 < len(self.document.wrap(index, self.width)):
+                line += 1
+            elif index + 1 < len(self.document):
+                index, line = index + 1, 0
+            else:
+                break
+            lines -= 1
+        while lines < 0:
+            if line > 0:
+                line -= 1
+            elif index > 0:
+                index -= 1
+                line = len(self.document.wrap(index, self.width)) - 1
+            else:
+                break
+            lines += 1
+        self.top = (index, line)
+
+    def visible_lines(self):
+        """
+        Yield (paragraph index, start, end) for every line in the viewport.
+        """
+        index, line = self.top
+        rows = 0
+        while rows < self.height and index < len(self.document):
+            for start, end in self.document.wrap(index, self.width)[line:]:
+                if rows == self.height:
+                    return
+                yield index, start, end
+                rows += 1
+            index, line = index + 1, 0
+
+    def _attribute(self, readability, findings: tuple, index: int) -> int:
+        if findings:
+            attribute = self.attributes.get(FINDING_FORMATS[findings[-1].finding], curses.A_UNDERLINE)
+            if self.selected is not None and self.selected[0] == index and self.selected[1] in findings:
+                attribute |= curses.A_REVERSE
+            return attribute
+        if readability in READABILITY_FORMATS:
+            return self.attributes.get(READABILITY_FORMATS[readability], curses.A_BOLD)
+        return curses.A_NORMAL
+
+    def draw(self) -> None:
+        self.screen.erase()
+        last_index = self.top[0]
+        for row, (index, start, end) in enumerate(self.visible_lines()):
+            last_index = index
+            paragraph = self.document.paragraphs[index]
+            _, segments = self.document.analyze(index)
+            column = 0
+            for segment_start, segment_end, readability, findings in segments:
+                text = paragraph[max(start, segment_start):min(end, segment_end)]
+                if text:
+                    try:
+                        self.screen.addstr(row, column, text, self._attribute(readability, findings, index))
+                    except curses.error:
+                        # wide characters ran past the edge of the screen
+                        break
+                    column += len(text)
+
+        if self.selected is not None:
+            index, finding = self.selected
+            status = get_finding_hint(finding.finding, self.document.paragraphs[index][finding.start:finding.end])
+        else:
+            status = '[n/N] next/previous finding  [space/b] page down/up  [q] quit'
+        status = (
+            f' {self.title}  {self.top[0] + 1}-{last_index + 1}/{len(self.document)}  '
+            f'{len(self.document.cache)} analyzed  {status}'
+        )
+        self.screen.addstr(self.height, 0, status[:self.width].ljust(self.width), curses.A_REVERSE)
+        self.screen.refresh()
+
+    def prefetch(self) -> bool:
+        """
+        Analyze one paragraph near the viewport that is not analyzed yet. Returns False if there is none.
+        """
+        first = self.top[0]
+        for index in range(first, min(first + self.height + PREFETCH, len(self.document))):
+            if not self.document.is_analyzed(index):
+                self.document.analyze(index)
+                return True
+        return False
+
+    def select(self, found) -> None:
+        """
+        Select the found (paragraph index, FindingSpan) and scroll to it, keeping a few lines of context above.
+        """
+        if found is None:
+            curses.beep()
+            return
+        self.selected = found
+        index, finding = found
+        lines = self.document.wrap(index, self.width)
+        line = next((i for i, (start, end) in enumerate(lines) if finding.start <= end), len(lines) - 1)
+        self.top = (index, line)
+        self.scroll(-min(3, self.height // 3))
+
+    def run(self) -> None:
+        pending = True
+        while True:
+            self.draw()
+            # wait for a key only when there is nothing left to prefetch
+            self.screen.timeout(0 if pending else -1)
+            key = self.screen.getch()
+            if key == -1:
+                pending = self.prefetch()
+                continue
+            pending = True
+
+            if key in (ord('q'), 27):
+                break
+            elif key in (ord('j'), curses.KEY_DOWN):
+                self.scroll(1)
+            elif key in (ord('k'), curses.KEY_UP):
+                self.scroll(-1)
+            elif key in (ord(' '), curses.KEY_NPAGE):
+                self.scroll(self.height - 1)
+            elif key in (ord('b'), curses.KEY_PPAGE):
+                self.scroll(-(self.height - 1))
+            elif key in (ord('g'), curses.KEY_HOME):
+                self.top = (0, 0)
+            elif key in (ord('G'), curses.KEY_END) and len(self.document):
+                last = len(self.document) - 1
+                self.top = (last, len(self.document.wrap(last, self.width)) - 1)
+                self.scroll(-(self.height - 1))
+            elif key in (ord('n'), ord('N')):
+                if self.selected is not None:
+                    index, offset = self.selected[0], self.selected[1].start
+                else:
+                    index, offset = self.top[0], -1
+                if key == ord('n'):
+                    self.select(self.document.next_finding(index, offset))
+                else:
+                    self.select(self.document.previous_finding(index, offset))
+
+
+def view(paragraphs: list, title: str = '', language: str = DEFAULT_LANGUAGE) -> None:
+    """
+    Open the text in the interactive viewer.
+    """
+    curses.wrapper(lambda screen: Viewer(screen, Document(paragraphs, language=language), title).run())
@@ -0,0 +1,235 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from functools import partial
+
+from text_processor import (
+    STAT,
+    process_text,
+    reset_stat,
+)
+from util.corpus_stat import DocumentStat
+from util.exceptions import FileNotReadable
+from util.file import get_file_contents
+from util.file_index import FileIndex
+from util.language import DEFAULT_LANGUAGE
+
+
+SUPPORTED_EXTENSIONS = ('.txt', '.md', '.rst', '.docx')
+
+
+def analyze_file(path: str, language: str = DEFAULT_LANGUAGE, with_corpus: bool = False) -> tuple:
+    """
+    Process the file on its own. Returns its text statistics and, if with_corpus is set, its DocumentStat.
+    Returns (None, None) if the file cannot be read or processed.
+    """
+    document_stat = DocumentStat() if with_corpus else None
+    try:
+        text = get_file_contents(path)
+        reset_stat()
+        process_text(text, document_stat, language=language)
+    except FileNotReadable as err:
+        print(err.message)
+        return None, None
+    except Exception as err:
+        # one broken file must not stop the scan of the whole tree
+        print(f'Cannot analyze file: {path} ({type(err).__name__}: {err})')
+        return None, None
+    return dict(STAT), document_stat
+
+
+def print_file_stat(path: str, stat: dict) -> None:
+    """
+    Print a one-line summary of the file's statistics.
+    """
+    print(
+        f'{path}: {stat["total_sentences"]} sentences, '
+        f'{stat["hard_sentences"]} hard, {stat["very_hard_sentences"]} very hard'
+    )
+
+
+def is_supported(path: str, extensions: tuple) -> bool:
+    return path.endswith(extensions)
+
+
+def update_path(
+    index: FileIndex,
+    path: str,
+    extensions: tuple,
+    language: str = DEFAULT_LANGUAGE,
+    with_corpus: bool = False,
+) -> bool:
+    """
+    Bring a single path up to date in the index. Returns True if the index changed.
+    """
+    if not is_supported(path, extensions):
+        return False
+    try:
+        file_stat = os.stat(path)
+    except FileNotFoundError:
+        return index.remove(path)
+    if index.is_unchanged(path, file_stat, language, with_corpus):
+        return False
+    try:
+        stat = index.update(
+            path, partial(analyze_file, language=language, with_corpus=with_corpus), file_stat, language, with_corpus
+        )
+    except OSError as err:
+        # e.g. no permission to read it, or removed in the meantime
+        print(f'Cannot read file: {path} ({err.strerror})')
+        return False
+    if stat is not None:
+        print_file_stat(path, stat)
+    return True
+
+
+def scan(
+    root: str,
+    index: FileIndex,
+    extensions: tuple = SUPPORTED_EXTENSIONS,
+    language: str = DEFAULT_LANGUAGE,
+    with_corpus: bool = False,
+) -> int:
+    """
+    Walk the tree and re-analyze only new and changed files. Unchanged files cost a single stat() call.
+    If with_corpus is set, the index also keeps corpus-level statistics of all the files.
+    Returns the number of index entries that changed.
+    """
+    root = os.path.abspath(root)
+    changes = 0
+    seen = set()
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if is_supported(path, extensions):
+                seen.add(path)
+                changes += update_path(index, path, extensions, language, with_corpus)
+    for path in index.paths_under(root):
+        if path not in seen:
+            changes += index.remove(path)
+    if changes:
+        index.save()
+    return changes
+
+
+class Inotify:
+    """
+    Minimal inotify binding over ctypes (Linux only).
+    """
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, libc, fd: int):
+        self.libc = libc
+        self.fd = fd
+        self.watches = {}
+
+    @classmethod
+    def create(cls):
+        """
+        Return an Inotify instance, or None if inotify is not available on this system.
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError, TypeError):
+            return None
+        return cls(libc, fd) if fd >= 0 else None
+
+    def add_tree(self, root: str) -> None:
+        """
+        Watch the directory and all of its subdirectories.
+        """
+        for dirpath, _, _ in os.walk(root):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd >= 0:
+                self.watches[wd] = dirpath
+
+    def read_events(self) -> list:
+        """
+        Return a list of (path, mask) for all pending events.
+        """
+        data = os.read(self.fd, 64 * 1024)
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if wd in self.watches:
+                events.append((os.path.join(self.watches[wd], os.fsdecode(name)), mask))
+        return events
+
+    def wait_for_changes(self, debounce: float) -> tuple:
+        """
+        Block until something changes, then keep collecting events until there are none for `debounce` seconds.
+        Returns the set of changed file paths and the set of directories that were deleted or moved away.
+        """
+        changed = set()
+        removed_directories = set()
+        timeout = None
+        while select.select([self.fd], [], [], timeout)[0]:
+            for path, mask in self.read_events():
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self.add_tree(path)
+                    for dirpath, _, filenames in os.walk(path):
+                        changed.update(os.path.join(dirpath, filename) for filename in filenames)
+                elif mask & self.IN_ISDIR and mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    removed_directories.add(path)
+                else:
+                    changed.add(path)
+            timeout = debounce
+        return changed, removed_directories
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def watch(
+    root: str,
+    index: FileIndex,
+    extensions: tuple = SUPPORTED_EXTENSIONS,
+    debounce: float = 0.5,
+    interval: float = 2.0,
+    language: str = DEFAULT_LANGUAGE,
+    with_corpus: bool = False,
+) -> None:
+    """
+    Scan the tree, then keep re-analyzing changed files until interrupted.
+    Uses inotify where available, and re-scans the tree every `interval` seconds otherwise.
+    """
+    root = os.path.abspath(root)
+    inotify = Inotify.create()
+    if inotify is not None:
+        inotify.add_tree(root)
+    scan(root, index, extensions, language, with_corpus)
+    print(f'Watching {root} ({"inotify" if inotify is not None else "polling"})...')
+
+    try:
+        while True:
+            if inotify is not None:
+                changed, removed_directories = inotify.wait_for_changes(debounce)
+                # only removed directories need a look through the whole index, to drop the files under them
+                for path in removed_directories:
+                    changed.update(index.paths_under(path))
+                changes = 0
+                for path in sorted(changed):
+                    changes += update_path(index, path, extensions, language, with_corpus)
+                if changes:
+                    index.save()
+            else:
+                time.sleep(interval)
+                scan(root, index, extensions, language, with_corpus)
+    finally:
+        if inotify is not None:
+            inotify.close()